@@ -11,15 +11,23 @@ Role: Independent Developer, Engineer, and Project Author
 Last Updated: 2025-11-16
 """
 
+import argparse
 import json
+import math
 import re
 import sys
-import serial
 import time
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Set, Tuple, Any
+from dataclasses import dataclass, field
 from enum import Enum
 
+try:
+    # Optional C-accelerated JSON codec; falls back to the standard library
+    import msgspec
+except ImportError:
+    msgspec = None
+
 DIGITAL_INTERFACE_LABELS: Dict[str, str] = {
     "01": "GPIO",
     "11": "I2C via TCA9534",
@@ -46,7 +54,7 @@ CHANNEL_TYPE_LABELS: Dict[str, str] = {
     "2": "Int (Analog Input)",
 }
 
-ANALOG_MEASUREMENT_RANGES = [
+ANALOG_MEASUREMENT_RANGES = (
     ("0b00000001", "Voltage 0-0.5V"),
     ("0b00000010", "Voltage 0-5V"),
     ("0b00000011", "Voltage 0-10V"),
@@ -57,12 +65,18 @@ ANALOG_MEASUREMENT_RANGES = [
     ("0b10100001", "Current ±20mA"),
     ("0b00100010", "Current 4-20mA"),
     ("0b00100011", "Current 0-40mA"),
-]
+)
 
-ANALOG_RANGE_LOOKUP: Dict[str, str] = {code: label for code, label in ANALOG_MEASUREMENT_RANGES}
+# Read-only lookup tables built once at import (used by Channel validation)
+ANALOG_RANGE_LOOKUP: Mapping[str, str] = MappingProxyType(dict(ANALOG_MEASUREMENT_RANGES))
+# Parallel code/label sequences for index-based menu rendering
+ANALOG_RANGE_CODES = tuple(code for code, _ in ANALOG_MEASUREMENT_RANGES)
+ANALOG_RANGE_LABELS = tuple(label for _, label in ANALOG_MEASUREMENT_RANGES)
 
-DIGITAL_INTERFACE_CODES = set(DIGITAL_INTERFACE_LABELS.keys())
-ANALOG_INTERFACE_CODES = set(ANALOG_INTERFACE_LABELS.keys())
+DIGITAL_INTERFACE_CODES = frozenset(DIGITAL_INTERFACE_LABELS)
+ANALOG_INTERFACE_CODES = frozenset(ANALOG_INTERFACE_LABELS)
+# Analog interface codes in menu order (menu entry n selects ANALOG_INTERFACE_MENU_CODES[n - 1])
+ANALOG_INTERFACE_MENU_CODES = tuple(ANALOG_INTERFACE_LABELS)
 
 # ADC sampling rate selection mapping (display value -> config code)
 ADC_SAMPLING_RATES: Dict[int, int] = {
@@ -75,12 +89,124 @@ ADC_SAMPLING_RATES: Dict[int, int] = {
     475: 6,  # 3300/475 SPS
     860: 7   # -/860 SPS
 }
+ADC_SAMPLING_RATES_SORTED: Tuple[int, ...] = tuple(sorted(ADC_SAMPLING_RATES))
+ADC_SAMPLING_RATES_SET = frozenset(ADC_SAMPLING_RATES)
+
+# One-byte hex I2C address, with or without the 0x prefix (e.g. "0x3f", "57")
+HEX_ADDR_RE = re.compile(r"\A(?:0[xX])?[0-9a-fA-F]{1,2}\Z")
+
+# Legacy per-ADC hardware keys ("adc_1_i2c_addr", "ADC1_I2C_ADDR", ...), capturing the ADC number
+ADC_ADDR_KEY_RE = re.compile(r"adc_?(\d+)_i2c_addr", re.IGNORECASE)
+
+# Maximum ADCs per mezzanine (ADS1115 address pins allow four per I2C bus)
+MAX_ADCS = 4
 
 # Default per-channel calibration values (used when hardware-level values are not present)
 DEFAULT_ADC_HARDWARE_GAIN: float = 0.23761904761904762
 DEFAULT_SHUNT_RESISTANCE: float = 0.249
 DEFAULT_ADC_OFFSET: float = 0.0
 
+# Default GPIO pin mapping for HOST connector (copied into each HardwareConfig)
+DEFAULT_GPIO_HOST_PINS: Mapping[int, int] = MappingProxyType({
+    1: 10,  # AP0
+    2: 11,  # AP1
+    3: 12,  # AP2
+    4: 13,  # AP3
+    5: 14,  # AP4
+    6: 15,  # AP5
+    7: 18,  # AP6
+    8: 19,  # AP7
+})
+
+
+def json_encode(obj: Any) -> bytes:
+    """Encode obj as compact JSON bytes"""
+    if msgspec is not None:
+        return msgspec.json.encode(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+def json_encode_pretty(obj: Any) -> bytes:
+    """Encode obj as JSON bytes indented by two spaces (configuration files)"""
+    if msgspec is not None:
+        return msgspec.json.format(msgspec.json.encode(obj), indent=2)
+    return json.dumps(obj, indent=2).encode()
+
+def json_decode(data) -> Any:
+    """Decode JSON from str or bytes, raising ValueError on malformed input"""
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(data)
+
+def prompt(message: str = "") -> str:
+    """Read one line of user input, bypassing input() when stdin is not a terminal (scripted runs)"""
+    if sys.stdin.isatty():
+        return input(message)
+    if message:
+        sys.stdout.write(message)
+        sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        # same message input() gives, so scripted runs report why they stopped
+        raise EOFError("EOF when reading a line")
+    return line.rstrip("\n")
+
+def menu(*lines: str):
+    """Write a block of menu lines with a single stdout write"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def import_serial():
+    """Import pyserial on first use so JSON-only sessions skip its import cost"""
+    try:
+        import serial
+    except ImportError:
+        print("pyserial is required for serial communication (pip install pyserial)")
+        return None
+    return serial
+
+# Serial framing shared with the firmware: <START>json<END> followed by a newline.
+# The firmware's stdout also carries boot and debug prints, so the markers let
+# either side skip that noise and resynchronise on the next frame.
+FRAME_START = b"<START>"
+FRAME_END = b"<END>"
+
+def frame_message(payload: bytes) -> bytes:
+    """Wrap an encoded JSON payload in the serial frame markers"""
+    return FRAME_START + payload + FRAME_END + b"\n"
+
+READ_COMMAND_MESSAGE = frame_message(b'{"command":"read"}')
+
+# Port read timeout: each read blocks at most this long when no bytes are waiting
+SERIAL_READ_TIMEOUT_S = 0.05
+
+def read_framed_response(serial_connection, timeout: float) -> Tuple[Optional[bytes], bytes]:
+    """Read up to the first end marker within timeout seconds.
+
+    Each read drains everything already waiting on the port (or blocks for one
+    byte up to the port timeout), so a frame costs a handful of reads rather
+    than one per byte. Returns (payload between the markers or None if no
+    complete frame arrived, raw bytes read).
+    """
+    buffer = bytearray()
+    deadline = time.monotonic() + timeout
+    end = -1
+    while end == -1 and time.monotonic() < deadline:
+        chunk = serial_connection.read(serial_connection.in_waiting or 1)
+        if chunk:
+            # Only the tail can complete a marker split across reads
+            search_from = max(0, len(buffer) - len(FRAME_END) + 1)
+            buffer += chunk
+            end = buffer.find(FRAME_END, search_from)
+    if end == -1:
+        return None, bytes(buffer)
+    raw = bytes(buffer[:end + len(FRAME_END)])
+    start = raw.find(FRAME_START)
+    if start == -1:
+        return None, raw
+    return raw[start + len(FRAME_START):end], raw
+
 
 class ModuleType(Enum):
     """Supported module types"""
@@ -88,6 +214,10 @@ class ModuleType(Enum):
     IOTBASE_NANO = "IoTbase Nano"
     IOTSMART_ESP32S3 = "IoTsmart ESP32-S3"
 
+# Module type menu, rendered once at import
+MODULE_TYPE_NAMES = tuple(m.value for m in ModuleType)
+MODULE_TYPE_MENU = "\n".join(f"  {i}. {name}" for i, name in enumerate(MODULE_TYPE_NAMES, 1))
+
 
 class InterfaceType(Enum):
     """Supported interface types"""
@@ -95,18 +225,100 @@ class InterfaceType(Enum):
     I2C_TCA9534 = "11"
     GPIO_AND_I2C = "12"  # Future expansion
 
+# Interface codes that require the I2C I/O expander address
+I2C_INTERFACE_CODES = frozenset({InterfaceType.I2C_TCA9534.value, InterfaceType.GPIO_AND_I2C.value})
+
 
 class ChannelType(Enum):
     """Channel types"""
     BIT = "1"  # Digital bit type
     ANALOG_INT = "2"  # Analog input (integer scaled)
 
+# Selectable (channel_type, label) options per mezzanine category
+DIGITAL_CHANNEL_TYPE_OPTIONS = ((ChannelType.BIT.value, CHANNEL_TYPE_LABELS[ChannelType.BIT.value]),)
+ANALOG_CHANNEL_TYPE_OPTIONS = ((ChannelType.ANALOG_INT.value, CHANNEL_TYPE_LABELS[ChannelType.ANALOG_INT.value]),)
+COMBO_CHANNEL_TYPE_OPTIONS = DIGITAL_CHANNEL_TYPE_OPTIONS + ANALOG_CHANNEL_TYPE_OPTIONS
+
 class HardwareMode(Enum):
     """Hardware modes"""
     GPIO = "gpio"
     I2C = "i2c"
 
-@dataclass
+def _parse_pin_config(text: str) -> int:
+    """Parse a pin configuration: 0b/0o/0x prefixed values in that base, plain digits as decimal"""
+    # Base 0 alone would reject zero-padded decimals such as "08"
+    base = 0 if text.strip()[:2].lower() in ('0b', '0o', '0x') else 10
+    return int(text, base)
+
+def _as_finite_float(value: Any) -> Optional[float]:
+    """Return value as a finite float, or None if it is not one (bools are rejected, numeric strings accepted)"""
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+def _validate_bit_channel(channel: "Channel") -> None:
+    """Validate a digital (bit) channel"""
+    # Validate interface mapping
+    if channel.interface_type not in DIGITAL_INTERFACE_CODES:
+        raise ValueError(f"Invalid digital interface type: {channel.interface_type}")
+
+    # Validate channel number
+    if not 0 <= channel.channel_number <= 7:
+        raise ValueError("Digital channel number must be between 0 and 7")
+
+    # Validate actions (only bit 0 is used for write in current version)
+    if channel.actions not in (0, 1):
+        raise ValueError("Digital channel actions must be 0 or 1 (0=read only, 1=read+write)")
+
+    # Digital channels must not specify measurement ranges
+    channel.measurement_range = None
+
+def _validate_analog_channel(channel: "Channel") -> None:
+    """Validate an analog input channel"""
+    # Validate interface mapping for analog
+    if channel.interface_type not in ANALOG_INTERFACE_CODES:
+        raise ValueError(f"Invalid analog interface type: {channel.interface_type}")
+
+    # Analog mezzanines may expose up to 8 channels (0-7)
+    if not 0 <= channel.channel_number <= 7:
+        raise ValueError("Analog channel number must be between 0 and 7")
+
+    if channel.actions != 0:
+        raise ValueError("Analog input channels are read-only; actions must be 0")
+
+    if channel.measurement_range not in ANALOG_RANGE_LOOKUP:
+        raise ValueError("Analog channels require a valid measurement range code")
+
+    # Validate optional per-channel ADC calibration values
+    if channel.adc_hardware_gain is not None:
+        gain = _as_finite_float(channel.adc_hardware_gain)
+        if gain is None or gain <= 0:
+            raise ValueError("adc_hardware_gain must be a positive float")
+        channel.adc_hardware_gain = gain
+
+    if channel.shunt_resistance is not None:
+        shunt = _as_finite_float(channel.shunt_resistance)
+        if shunt is None or shunt <= 0:
+            raise ValueError("shunt_resistance must be a positive float")
+        channel.shunt_resistance = shunt
+
+    if channel.adc_offset is not None:
+        offset = _as_finite_float(channel.adc_offset)
+        if offset is None:
+            raise ValueError("adc_offset must be a numeric value")
+        channel.adc_offset = offset
+
+# Per-channel-type validators, keyed by ChannelType value
+_CHANNEL_VALIDATORS = {
+    ChannelType.BIT.value: _validate_bit_channel,
+    ChannelType.ANALOG_INT.value: _validate_analog_channel,
+}
+
+@dataclass(slots=True)
 class Channel:
     """Channel configuration"""
     name: str
@@ -125,73 +337,58 @@ class Channel:
         if len(self.name) > 8:
             raise ValueError("Channel name must be 8 characters or less")
         
-        if self.channel_type not in CHANNEL_TYPE_LABELS:
+        validator = _CHANNEL_VALIDATORS.get(self.channel_type)
+        if validator is None:
             raise ValueError(f"Unsupported channel type: {self.channel_type}")
-
-        if self.channel_type == ChannelType.BIT.value:
-            # Validate interface mapping
-            if self.interface_type not in DIGITAL_INTERFACE_CODES:
-                raise ValueError(f"Invalid digital interface type: {self.interface_type}")
-
-            # Validate channel number
-            if not 0 <= self.channel_number <= 7:
-                raise ValueError("Digital channel number must be between 0 and 7")
-
-            # Validate actions (only bit 0 is used for write in current version)
-            if self.actions not in (0, 1):
-                raise ValueError("Digital channel actions must be 0 or 1 (0=read only, 1=read+write)")
-
-            # Digital channels must not specify measurement ranges
-            self.measurement_range = None
-
-        elif self.channel_type == ChannelType.ANALOG_INT.value:
-            # Validate interface mapping for analog
-            if self.interface_type not in ANALOG_INTERFACE_CODES:
-                raise ValueError(f"Invalid analog interface type: {self.interface_type}")
-
-            # Analog mezzanines may expose up to 8 channels (0-7)
-            if not 0 <= self.channel_number <= 7:
-                raise ValueError("Analog channel number must be between 0 and 7")
-
-            if self.actions != 0:
-                raise ValueError("Analog input channels are read-only; actions must be 0")
-
-            if self.measurement_range not in ANALOG_RANGE_LOOKUP:
-                raise ValueError("Analog channels require a valid measurement range code")
-
-            # Validate optional per-channel ADC calibration values
+        validator(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the channel as a plain dict; analog-only fields are omitted for
+        digital channels and when unset"""
+        data = {
+            'name': self.name,
+            'channel_type': self.channel_type,
+            'interface_type': self.interface_type,
+            'channel_number': self.channel_number,
+            'actions': self.actions,
+        }
+        if self.channel_type != ChannelType.BIT.value:
+            if self.measurement_range is not None:
+                data['measurement_range'] = self.measurement_range
             if self.adc_hardware_gain is not None:
-                try:
-                    g = float(self.adc_hardware_gain)
-                    if g <= 0:
-                        raise ValueError("adc_hardware_gain must be positive")
-                except (TypeError, ValueError):
-                    raise ValueError("adc_hardware_gain must be a positive float")
-
+                data['adc_hardware_gain'] = self.adc_hardware_gain
             if self.shunt_resistance is not None:
-                try:
-                    r = float(self.shunt_resistance)
-                    if r <= 0:
-                        raise ValueError("shunt_resistance must be positive")
-                except (TypeError, ValueError):
-                    raise ValueError("shunt_resistance must be a positive float")
-
+                data['shunt_resistance'] = self.shunt_resistance
             if self.adc_offset is not None:
-                try:
-                    float(self.adc_offset)
-                except (TypeError, ValueError):
-                    raise ValueError("adc_offset must be a numeric value")
-
-        else:
-            raise ValueError(f"Unknown channel type: {self.channel_type}")
+                data['adc_offset'] = self.adc_offset
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Channel":
+        """Build a channel from a dict as produced by to_dict (optional keys may be absent)"""
+        return cls(
+            name=data['name'],
+            channel_type=data['channel_type'],
+            interface_type=data['interface_type'],
+            channel_number=data['channel_number'],
+            actions=data['actions'],
+            measurement_range=data.get('measurement_range'),
+            adc_hardware_gain=data.get('adc_hardware_gain'),
+            shunt_resistance=data.get('shunt_resistance'),
+            adc_offset=data.get('adc_offset'),
+        )
 
-@dataclass
+@dataclass(slots=True)
 class NetworkConfig:
     """Network configuration"""
     wifi_ssid: str = ""
     wifi_password: str = ""
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the network fields as a plain dict"""
+        return {'wifi_ssid': self.wifi_ssid, 'wifi_password': self.wifi_password}
+
+@dataclass(slots=True)
 class MQTTConfig:
     """MQTT configuration"""
     broker: str = ""
@@ -199,7 +396,16 @@ class MQTTConfig:
     client_id: str = "pico-iotextra-controller-1"
     base_topic: str = "iotextra/device_1"
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the MQTT fields as a plain dict"""
+        return {
+            'broker': self.broker,
+            'port': self.port,
+            'client_id': self.client_id,
+            'base_topic': self.base_topic,
+        }
+
+@dataclass(slots=True)
 class HardwareConfig:
     """Hardware configuration"""
     mode: str = "i2c"  # "i2c" or "gpio"
@@ -216,7 +422,7 @@ class HardwareConfig:
     
     # ADC Configuration (for analog modules)
     num_of_adcs: int = 0
-    adc_i2c_addresses: Dict[int, str] = None  # Maps ADC number (1, 2, 3, 4) to I2C address
+    adc_i2c_addresses: List[Optional[str]] = None  # I2C address of ADC n at index n-1 (None if unused)
     # ADC runtime options
     adc_sampling_rate: int = 128  # In SPS (one of keys from ADC_SAMPLING_RATES)
     # GPIO configuration
@@ -224,21 +430,37 @@ class HardwareConfig:
     
     def __post_init__(self):
         if self.adc_i2c_addresses is None:
-            self.adc_i2c_addresses = {}
+            self.adc_i2c_addresses = [None] * MAX_ADCS
+        elif isinstance(self.adc_i2c_addresses, dict):
+            # Legacy {adc_number: address} mapping
+            addrs = [None] * MAX_ADCS
+            for adc_num, addr in self.adc_i2c_addresses.items():
+                if 1 <= int(adc_num) <= MAX_ADCS:
+                    addrs[int(adc_num) - 1] = addr
+            self.adc_i2c_addresses = addrs
+        else:
+            addrs = list(self.adc_i2c_addresses[:MAX_ADCS])
+            self.adc_i2c_addresses = addrs + [None] * (MAX_ADCS - len(addrs))
         if self.gpio_host_pins is None:
-            # Default GPIO pin mapping for HOST connector
-            self.gpio_host_pins = {
-                1: 10,  # AP0
-                2: 11,  # AP1
-                3: 12,  # AP2
-                4: 13,  # AP3
-                5: 14,  # AP4
-                6: 15,  # AP5
-                7: 18,  # AP6
-                8: 19,  # AP7
-            }
-
-@dataclass
+            self.gpio_host_pins = dict(DEFAULT_GPIO_HOST_PINS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the hardware fields as a plain dict (mapping fields are shallow-copied)"""
+        return {
+            'mode': self.mode,
+            'i2c_bus_id': self.i2c_bus_id,
+            'i2c_sda_pin': self.i2c_sda_pin,
+            'i2c_scl_pin': self.i2c_scl_pin,
+            'i2c_device_addr': self.i2c_device_addr,
+            'eeprom_i2c_addr': self.eeprom_i2c_addr,
+            'eeprom_size': self.eeprom_size,
+            'num_of_adcs': self.num_of_adcs,
+            'adc_i2c_addresses': list(self.adc_i2c_addresses),
+            'adc_sampling_rate': self.adc_sampling_rate,
+            'gpio_host_pins': dict(self.gpio_host_pins),
+        }
+
+@dataclass(slots=True)
 class Configuration:
     """Complete configuration for a digital I/O node"""
     module_type: str
@@ -254,9 +476,18 @@ class Configuration:
     pin_config: str = "0b00001111"  # Default: channels 0-3 are outputs, 4-7 are inputs
     status_update_interval_s: int = 30
     
+    # Index of channel names for O(1) duplicate checks (kept in sync by the channel helpers below)
+    _channel_names: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         if self.channels is None:
             self.channels = []
+        self._channel_names = {ch.name for ch in self.channels}
+        # The name index holds each name once, so a duplicate would fall out of sync on remove/rename
+        if len(self._channel_names) != len(self.channels):
+            names = [ch.name for ch in self.channels]
+            duplicates = sorted({name for name in names if names.count(name) > 1})
+            raise ValueError(f"Duplicate channel names: {', '.join(duplicates)}")
         
         if self.network is None:
             self.network = NetworkConfig()
@@ -273,18 +504,56 @@ class Configuration:
         
         # Note: interface codes are specified per-channel. Top-level interface
         # is not stored. Validate I2C device address if any channel uses I2C.
-        uses_i2c = any(ch.interface_type in {InterfaceType.I2C_TCA9534.value, InterfaceType.GPIO_AND_I2C.value} for ch in self.channels)
+        uses_i2c = False
+        for ch in self.channels:
+            if ch.interface_type in I2C_INTERFACE_CODES:
+                uses_i2c = True
+                break
         if uses_i2c and not self.hardware.i2c_device_addr:
             raise ValueError("I2C address must be specified when channels use I2C interfaces")
         
         # Validate pin configuration
         try:
-            pin_config_int = int(self.pin_config, 2) if self.pin_config.startswith('0b') else int(self.pin_config, 16) if self.pin_config.startswith('0x') else int(self.pin_config)
+            pin_config_int = _parse_pin_config(self.pin_config)
             if not 0 <= pin_config_int <= 0xFF:
                 raise ValueError("Pin configuration must be between 0 and 255")
         except ValueError:
             raise ValueError("Invalid pin configuration format")
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the configuration as nested plain dicts"""
+        return {
+            'module_type': self.module_type,
+            'mezzanine_type': self.mezzanine_type,
+            'channels': [ch.to_dict() for ch in self.channels],
+            'network': self.network.to_dict(),
+            'mqtt': self.mqtt.to_dict(),
+            'hardware': self.hardware.to_dict(),
+            'pin_config': self.pin_config,
+            'status_update_interval_s': self.status_update_interval_s,
+        }
+
+    def has_channel_name(self, name: str) -> bool:
+        """Return True if a channel with this name already exists"""
+        return name in self._channel_names
+
+    def add_channel(self, channel: Channel) -> None:
+        """Append a channel and index its name"""
+        self.channels.append(channel)
+        self._channel_names.add(channel.name)
+
+    def remove_channel(self, index: int) -> Channel:
+        """Remove and return the channel at the given list index"""
+        removed = self.channels.pop(index)
+        self._channel_names.discard(removed.name)
+        return removed
+
+    def rename_channel(self, channel: Channel, new_name: str) -> None:
+        """Rename a channel and update the name index"""
+        self._channel_names.discard(channel.name)
+        channel.name = new_name
+        self._channel_names.add(new_name)
+
 class Configurator:
     """Main configuration tool"""
     
@@ -292,21 +561,22 @@ class Configurator:
         self.config = None
         self.config_file = None
         self.is_analog_module = False
+        # Framed JSON message for send_to_pi; cleared whenever the configuration changes
+        self._config_payload: Optional[bytes] = None
     
     def create_new_config(self):
         """Create a new configuration interactively"""
+        self._config_payload = None
         print("\n=== Creating New Configuration ===\n")
         
         # Module type selection
-        print("Available module types:")
-        for i, module_type in enumerate(ModuleType, 1):
-            print(f"  {i}. {module_type.value}")
+        menu("Available module types:", MODULE_TYPE_MENU)
         
         while True:
             try:
-                choice = int(input("\nSelect module type (1-3): ")) - 1
-                if 0 <= choice < len(ModuleType):
-                    module_type = list(ModuleType)[choice].value
+                choice = int(prompt("\nSelect module type (1-3): ")) - 1
+                if 0 <= choice < len(MODULE_TYPE_NAMES):
+                    module_type = MODULE_TYPE_NAMES[choice]
                     break
                 else:
                     print("Invalid choice. Please select 1-3.")
@@ -314,12 +584,12 @@ class Configurator:
                 print("Please enter a valid number.")
 
         # Interface category selection
-        print("\nSelect mezzanine category:")
-        print("  1. Digital I/O mezzanines")
-        print("  2. Analog input mezzanines")
+        menu("\nSelect mezzanine category:",
+             "  1. Digital I/O mezzanines",
+             "  2. Analog input mezzanines")
 
         while True:
-            category_choice = input("\nSelect category (1-2): ").strip()
+            category_choice = prompt("\nSelect category (1-2): ").strip()
             if category_choice in {"1", "2"}:
                 break
             print("Please select 1 or 2.")
@@ -342,19 +612,18 @@ class Configurator:
                 "IoTextra SSR Small",
             ]
 
-        print("\nAvailable mezzanine types:")
-        for idx, name in enumerate(mezzanine_menu, 1):
-            print(f"  {idx}. {name}")
-        print(f"  {len(mezzanine_menu)+1}. Custom mezzanine (enter name)")
+        menu("\nAvailable mezzanine types:",
+             *(f"  {idx}. {name}" for idx, name in enumerate(mezzanine_menu, 1)),
+             f"  {len(mezzanine_menu)+1}. Custom mezzanine (enter name)")
 
         while True:
             try:
-                choice = int(input("\nSelect mezzanine type: ")) - 1
+                choice = int(prompt("\nSelect mezzanine type: ")) - 1
                 if 0 <= choice < len(mezzanine_menu):
                     mezzanine_type = mezzanine_menu[choice]
                     break
                 elif choice == len(mezzanine_menu):
-                    mezzanine_type = input("Enter custom mezzanine type name: ").strip()
+                    mezzanine_type = prompt("Enter custom mezzanine type name: ").strip()
                     break
                 else:
                     print(f"Invalid choice. Please select 1-{len(mezzanine_menu)+1}.")
@@ -390,12 +659,12 @@ class Configurator:
         print(f"\n=== Network Configuration ===")
         
         # Wi-Fi SSID
-        wifi_ssid = input("Wi-Fi SSID: ").strip()
+        wifi_ssid = prompt("Wi-Fi SSID: ").strip()
         if wifi_ssid:
             self.config.network.wifi_ssid = wifi_ssid
         
         # Wi-Fi Password
-        wifi_password = input("Wi-Fi Password: ").strip()
+        wifi_password = prompt("Wi-Fi Password: ").strip()
         if wifi_password:
             self.config.network.wifi_password = wifi_password
     
@@ -404,13 +673,13 @@ class Configurator:
         print(f"\n=== MQTT Configuration ===")
         
         # MQTT Broker
-        broker = input("MQTT Broker address (default: empty): ").strip()
+        broker = prompt("MQTT Broker address (default: empty): ").strip()
         if broker:
             self.config.mqtt.broker = broker
         
         # MQTT Port
         while True:
-            port_input = input("MQTT Port (default: 1883): ").strip()
+            port_input = prompt("MQTT Port (default: 1883): ").strip()
             if not port_input:
                 break
             try:
@@ -424,12 +693,12 @@ class Configurator:
                 print("Please enter a valid port number")
         
         # MQTT Client ID
-        client_id = input("MQTT Client ID (default: pico-iotextra-controller-1): ").strip()
+        client_id = prompt("MQTT Client ID (default: pico-iotextra-controller-1): ").strip()
         if client_id:
             self.config.mqtt.client_id = client_id
         
         # MQTT Base Topic
-        base_topic = input("MQTT Base Topic (default: iotextra/device_1): ").strip()
+        base_topic = prompt("MQTT Base Topic (default: iotextra/device_1): ").strip()
         if base_topic:
             self.config.mqtt.base_topic = base_topic
     
@@ -442,12 +711,10 @@ class Configurator:
             print("Analog input mezzanines require I2C mode. Setting hardware mode to I2C.")
             self.config.hardware.mode = HardwareMode.I2C.value
         else:
-            print("Hardware Mode:")
-            print("1. GPIO")
-            print("2. I2C")
+            menu("Hardware Mode:", "1. GPIO", "2. I2C")
             
             while True:
-                choice = input("Select mode (1-2, default: 2): ").strip()
+                choice = prompt("Select mode (1-2, default: 2): ").strip()
                 if not choice:
                     self.config.hardware.mode = "i2c"
                     break
@@ -465,7 +732,7 @@ class Configurator:
             print("\nI2C Configuration:")
             
             # I2C Bus ID
-            bus_id_input = input("I2C Bus ID (default: 0): ").strip()
+            bus_id_input = prompt("I2C Bus ID (default: 0): ").strip()
             if bus_id_input:
                 try:
                     self.config.hardware.i2c_bus_id = int(bus_id_input)
@@ -473,7 +740,7 @@ class Configurator:
                     print("Invalid bus ID, using default: 0")
             
             # I2C SDA Pin
-            sda_input = input("I2C SDA Pin (default: 20): ").strip()
+            sda_input = prompt("I2C SDA Pin (default: 20): ").strip()
             if sda_input:
                 try:
                     self.config.hardware.i2c_sda_pin = int(sda_input)
@@ -481,7 +748,7 @@ class Configurator:
                     print("Invalid SDA pin, using default: 20")
             
             # I2C SCL Pin
-            scl_input = input("I2C SCL Pin (default: 21): ").strip()
+            scl_input = prompt("I2C SCL Pin (default: 21): ").strip()
             if scl_input:
                 try:
                     self.config.hardware.i2c_scl_pin = int(scl_input)
@@ -490,28 +757,25 @@ class Configurator:
             
             # I2C Device Address
             while True:
-                device_addr = input("I2C I/O Expander Device Address (hex, default: 0x3f or 0x27): ").strip()
+                device_addr = prompt("I2C I/O Expander Device Address (hex, default: 0x3f or 0x27): ").strip()
                 if not device_addr:
                     device_addr = "0x3f"
-                try:
-                    int(device_addr, 16)
+                if HEX_ADDR_RE.match(device_addr):
                     self.config.hardware.i2c_device_addr = device_addr
                     break
-                except ValueError:
-                    print("Please enter a valid hexadecimal address (e.g., 0x3f)")
+                print("Please enter a valid hexadecimal address (e.g., 0x3f)")
 
             # EEPROM Configuration
             print("\nEEPROM Configuration:")
             
-            eeprom_addr = input("EEPROM I2C Address (hex, default: 0x57): ").strip()
+            eeprom_addr = prompt("EEPROM I2C Address (hex, default: 0x57): ").strip()
             if eeprom_addr:
-                try:
-                    int(eeprom_addr, 16)
+                if HEX_ADDR_RE.match(eeprom_addr):
                     self.config.hardware.eeprom_i2c_addr = eeprom_addr
-                except ValueError:
+                else:
                     print("Invalid hex address, using default: 0x57")
 
-            eeprom_size_input = input("EEPROM Size in bytes (default: 1024): ").strip()
+            eeprom_size_input = prompt("EEPROM Size in bytes (default: 1024): ").strip()
             if eeprom_size_input:
                 try:
                     self.config.hardware.eeprom_size = int(eeprom_size_input)
@@ -524,9 +788,12 @@ class Configurator:
             num_adcs = MEZZANINE_ADC_COUNT.get(self.config.mezzanine_type, 0)
             if num_adcs == 0:
                 try:
-                    num_adcs = int(input("Enter number of ADCs on this mezzanine (default 2): ").strip() or "2")
+                    num_adcs = int(prompt("Enter number of ADCs on this mezzanine (default 2): ").strip() or "2")
                 except ValueError:
                     num_adcs = 2
+                if num_adcs > MAX_ADCS:
+                    print(f"At most {MAX_ADCS} ADCs are supported, using {MAX_ADCS}.")
+                    num_adcs = MAX_ADCS
 
             if num_adcs > 0:
                 self.config.hardware.num_of_adcs = num_adcs
@@ -538,41 +805,39 @@ class Configurator:
                 for adc_num in range(1, num_adcs + 1):
                     while True:
                         default_addr = "0x49" if adc_num == 1 else "0x48"
-                        addr_input = input(f"Enter I2C address for ADC {adc_num} (hex, default: {default_addr}): ").strip()
+                        addr_input = prompt(f"Enter I2C address for ADC {adc_num} (hex, default: {default_addr}): ").strip()
                         if not addr_input:
                             addr_input = default_addr
                         
-                        try:
-                            # Validate hex format
-                            addr_int = int(addr_input, 16)
-                            if not (0x03 <= addr_int <= 0x77):
-                                print("I2C address must be in range 0x03-0x77 (7-bit address)")
-                                continue
-                            
-                            # Check for duplicates
-                            if addr_input in used_addresses:
-                                print(f"Address {addr_input} already used. Please choose a different address.")
-                                continue
-                            
-                            used_addresses.add(addr_input)
-                            self.config.hardware.adc_i2c_addresses[adc_num] = addr_input
-                            print(f"ADC {adc_num} I2C address set to: {addr_input}")
-                            break
-                        except ValueError:
+                        # Validate hex format
+                        if not HEX_ADDR_RE.match(addr_input):
                             print("Please enter a valid hexadecimal address (e.g., 0x49)")
+                            continue
+                        addr_int = int(addr_input, 16)
+                        if not (0x03 <= addr_int <= 0x77):
+                            print("I2C address must be in range 0x03-0x77 (7-bit address)")
+                            continue
+                        
+                        # Check for duplicates
+                        if addr_input in used_addresses:
+                            print(f"Address {addr_input} already used. Please choose a different address.")
+                            continue
+                        
+                        used_addresses.add(addr_input)
+                        self.config.hardware.adc_i2c_addresses[adc_num - 1] = addr_input
+                        print(f"ADC {adc_num} I2C address set to: {addr_input}")
+                        break
                 
                 # --- ADC runtime options: sampling rate, hardware gain, shunt, offset ---
-                try:
-                    rates = sorted(ADC_SAMPLING_RATES.keys())
-                except NameError:
-                    rates = [8, 16, 32, 64, 128, 250, 475, 860]
+                rates = ADC_SAMPLING_RATES_SORTED
 
-                print("\nADC Sampling Rate options:")
-                for idx, r in enumerate(rates, 1):
-                    marker = " (current)" if r == self.config.hardware.adc_sampling_rate else ""
-                    print(f"  {idx}. {r} SPS{marker}")
+                current_rate = self.config.hardware.adc_sampling_rate
+                menu("\nADC Sampling Rate options:", *(
+                    f"  {idx}. {r} SPS{' (current)' if r == current_rate else ''}"
+                    for idx, r in enumerate(rates, 1)
+                ))
 
-                sr_choice = input(f"Select ADC sampling rate (1-{len(rates)}) or enter value in SPS (default: {self.config.hardware.adc_sampling_rate}): ").strip()
+                sr_choice = prompt(f"Select ADC sampling rate (1-{len(rates)}) or enter value in SPS (default: {self.config.hardware.adc_sampling_rate}): ").strip()
                 if sr_choice:
                     try:
                         idx = int(sr_choice) - 1
@@ -580,27 +845,27 @@ class Configurator:
                             self.config.hardware.adc_sampling_rate = rates[idx]
                         else:
                             val = int(sr_choice)
-                            if val in rates:
+                            if val in ADC_SAMPLING_RATES_SET:
                                 self.config.hardware.adc_sampling_rate = val
                     except ValueError:
                         try:
                             val = int(sr_choice)
-                            if val in rates:
+                            if val in ADC_SAMPLING_RATES_SET:
                                 self.config.hardware.adc_sampling_rate = val
                         except ValueError:
                             print("Invalid sampling rate selection, keeping default.")
                 # (hardware-level gain/shunt/offset were removed; per-channel calibration is used)
         
         # GPIO Host Pins (always configurable)
-        print("\nGPIO Host Pin Configuration:")
-        print("Current mapping:")
-        for channel, pin in self.config.hardware.gpio_host_pins.items():
-            print(f"  Channel {channel}: GPIO {pin}")
+        menu("\nGPIO Host Pin Configuration:", "Current mapping:", *(
+            f"  Channel {channel}: GPIO {pin}"
+            for channel, pin in self.config.hardware.gpio_host_pins.items()
+        ))
         
-        change_pins = input("Change GPIO pin mapping? (y/n, default: n): ").strip().lower()
+        change_pins = prompt("Change GPIO pin mapping? (y/n, default: n): ").strip().lower()
         if change_pins in ['y', 'yes']:
             for channel in range(1, 9):
-                pin_input = input(f"GPIO pin for Channel {channel} (current: {self.config.hardware.gpio_host_pins[channel]}): ").strip()
+                pin_input = prompt(f"GPIO pin for Channel {channel} (current: {self.config.hardware.gpio_host_pins[channel]}): ").strip()
                 if pin_input:
                     try:
                         pin = int(pin_input)
@@ -611,44 +876,38 @@ class Configurator:
     def configure_pin_config(self):
         """Configure pin configuration (input/output)"""
         if self.is_analog_module:
-            print(f"\n=== Pin Configuration ===")
-            print("Analog input mezzanines don't use digital pin configuration.")
-            print("Measurement ranges are defined per analog channel instead.")
+            menu("\n=== Pin Configuration ===",
+                 "Analog input mezzanines don't use digital pin configuration.",
+                 "Measurement ranges are defined per analog channel instead.")
             return
 
-        print(f"\n=== Pin Configuration ===")
-        print("Pin Configuration determines which channels are inputs vs outputs")
-        print("Format: 0b[P7][P6][P5][P4][P3][P2][P1][P0]")
-        print("1 = Input channel, 0 = Output channel")
-        
-        # Display current configuration
-        current_int = int(self.config.pin_config, 2) if self.config.pin_config.startswith('0b') else int(self.config.pin_config, 16) if self.config.pin_config.startswith('0x') else int(self.config.pin_config)
-        print(f"Current: {self.config.pin_config} (0b{current_int:08b})")
-        
-        # Show examples
-        print("\nExamples:")
-        print("IoTExtra Relay2: 0b11110000 (P4-P7 i.e. channels 5-8 are unused, 1-4 are outputs)")
-        print("IoTExtra Input:  0b11111111 (all channels are inputs)")
-        print("IoTExtra Octal:  0b00001111 (channels 0-3 outputs, 4-7 inputs)")
+        # Display current configuration and examples
+        current_int = _parse_pin_config(self.config.pin_config)
+        menu(
+            "\n=== Pin Configuration ===",
+            "Pin Configuration determines which channels are inputs vs outputs",
+            "Format: 0b[P7][P6][P5][P4][P3][P2][P1][P0]",
+            "1 = Input channel, 0 = Output channel",
+            f"Current: {self.config.pin_config} (0b{current_int:08b})",
+            "\nExamples:",
+            "IoTExtra Relay2: 0b11110000 (P4-P7 i.e. channels 5-8 are unused, 1-4 are outputs)",
+            "IoTExtra Input:  0b11111111 (all channels are inputs)",
+            "IoTExtra Octal:  0b00001111 (channels 0-3 outputs, 4-7 inputs)",
+        )
         
         # Get new configuration
         while True:
-            config_input = input("\nEnter pin configuration (binary format preferred, e.g., 0b00001111, default: current): ").strip()
+            config_input = prompt("\nEnter pin configuration (binary format preferred, e.g., 0b00001111, default: current): ").strip()
             if not config_input:
                 break
             
             try:
+                # Binary (0b...), hex (0x...) or decimal
+                pin_config_int = _parse_pin_config(config_input)
                 if config_input.startswith('0b'):
-                    # Binary format (preferred)
-                    pin_config_int = int(config_input, 2)
+                    # Binary format (preferred) is stored as entered
                     pin_config_str = config_input
-                elif config_input.startswith('0x'):
-                    # Hex format
-                    pin_config_int = int(config_input, 16)
-                    pin_config_str = f"0b{pin_config_int:08b}"
                 else:
-                    # Decimal format
-                    pin_config_int = int(config_input)
                     pin_config_str = f"0b{pin_config_int:08b}"
                 
                 if 0 <= pin_config_int <= 0xFF:
@@ -661,7 +920,7 @@ class Configurator:
                 print("Invalid format. Use binary (0b...), hex (0x...), or decimal")
         
         # Status update interval
-        interval_input = input("Status update interval in seconds (default: 30): ").strip()
+        interval_input = prompt("Status update interval in seconds (default: 30): ").strip()
         if interval_input:
             try:
                 interval = int(interval_input)
@@ -674,11 +933,12 @@ class Configurator:
     
     def configure_channels(self):
         """Configure channels for the node"""
+        self._config_payload = None
         print(f"\n=== Configuring Channels ===")
         print(f"Maximum 8 channels allowed. Current: {len(self.config.channels)}")
         
         while True:
-            action = input("\nChannel actions:\n1. Add channel\n2. Edit channel\n3. Remove channel\n4. View channels\n5. Done\nSelect (1-5): ").strip()
+            action = prompt("\nChannel actions:\n1. Add channel\n2. Edit channel\n3. Remove channel\n4. View channels\n5. Done\nSelect (1-5): ").strip()
             
             if action == "1":
                 self.add_channel()
@@ -696,24 +956,31 @@ class Configurator:
             else:
                 print("Invalid choice. Please select 1-5.")
     
+    def _available_channel_numbers(self, excluding: Optional[Channel] = None) -> List[int]:
+        """Channel numbers 0-7 not used by any channel other than `excluding`, ascending"""
+        used = {ch.channel_number for ch in self.config.channels if ch is not excluding}
+        return [i for i in range(8) if i not in used]
+
     def prompt_measurement_range(self, current: Optional[str] = None) -> str:
         """Prompt the user to select an analog measurement range."""
         print("\nSelect measurement range for this analog channel:")
-        for idx, (code, label) in enumerate(ANALOG_MEASUREMENT_RANGES, 1):
+        num_ranges = len(ANALOG_RANGE_CODES)
+        for idx in range(num_ranges):
+            code = ANALOG_RANGE_CODES[idx]
             marker = " (current)" if code == current else ""
-            print(f"{idx}. {label} [{code}]{marker}")
+            print(f"{idx + 1}. {ANALOG_RANGE_LABELS[idx]} [{code}]{marker}")
 
         while True:
-            choice = input("Select range (1-{}): ".format(len(ANALOG_MEASUREMENT_RANGES))).strip()
+            choice = prompt("Select range (1-{}): ".format(num_ranges)).strip()
             try:
                 idx = int(choice) - 1
-                if 0 <= idx < len(ANALOG_MEASUREMENT_RANGES):
-                    selected = ANALOG_MEASUREMENT_RANGES[idx][0]
-                    print(f"Measurement range set to {ANALOG_RANGE_LOOKUP[selected]} ({selected})")
+                if 0 <= idx < num_ranges:
+                    selected = ANALOG_RANGE_CODES[idx]
+                    print(f"Measurement range set to {ANALOG_RANGE_LABELS[idx]} ({selected})")
                     return selected
             except ValueError:
                 pass
-            print(f"Please select a value between 1 and {len(ANALOG_MEASUREMENT_RANGES)}.")
+            print(f"Please select a value between 1 and {num_ranges}.")
 
     def add_channel(self):
         """Add a new channel"""
@@ -725,10 +992,10 @@ class Configurator:
         
         # Channel name
         while True:
-            name = input("Channel name (max 8 chars): ").strip()
+            name = prompt("Channel name (max 8 chars): ").strip()
             if len(name) <= 8 and name:
                 # Check for duplicate names
-                if any(ch.name == name for ch in self.config.channels):
+                if self.config.has_channel_name(name):
                     print("Channel name already exists. Please choose a different name.")
                     continue
                 break
@@ -738,24 +1005,21 @@ class Configurator:
         # Determine available channel types
         # IoTextra Combo mezzanine supports both digital and analog channels
         if self.config.mezzanine_type == "IoTextra Combo":
-            channel_type_options = [
-                (ChannelType.BIT.value, CHANNEL_TYPE_LABELS[ChannelType.BIT.value]),
-                (ChannelType.ANALOG_INT.value, CHANNEL_TYPE_LABELS[ChannelType.ANALOG_INT.value])
-            ]
+            channel_type_options = COMBO_CHANNEL_TYPE_OPTIONS
         elif self.is_analog_module:
-            channel_type_options = [(ChannelType.ANALOG_INT.value, CHANNEL_TYPE_LABELS[ChannelType.ANALOG_INT.value])]
+            channel_type_options = ANALOG_CHANNEL_TYPE_OPTIONS
         else:
-            channel_type_options = [(ChannelType.BIT.value, CHANNEL_TYPE_LABELS[ChannelType.BIT.value])]
+            channel_type_options = DIGITAL_CHANNEL_TYPE_OPTIONS
 
         if len(channel_type_options) == 1:
             channel_type = channel_type_options[0][0]
             print(f"Channel type: {channel_type} ({channel_type_options[0][1]})")
         else:
-            print("Available channel types:")
-            for idx, (_, label) in enumerate(channel_type_options, 1):
-                print(f"{idx}. {label}")
+            menu("Available channel types:", *(
+                f"{idx}. {label}" for idx, (_, label) in enumerate(channel_type_options, 1)
+            ))
             while True:
-                choice = input("Select channel type: ").strip()
+                choice = prompt("Select channel type: ").strip()
                 try:
                     idx = int(choice) - 1
                     if 0 <= idx < len(channel_type_options):
@@ -769,11 +1033,13 @@ class Configurator:
         if channel_type == ChannelType.BIT.value:
             # Digital channels on combo mezzanines need to choose GPIO or I2C
             if self.config.mezzanine_type == "IoTextra Combo":
-                print("Digital channels on IoTextra Combo require a digital interface:")
-                print(f"1. {DIGITAL_INTERFACE_LABELS[InterfaceType.GPIO.value]} ({InterfaceType.GPIO.value})")
-                print(f"2. {DIGITAL_INTERFACE_LABELS[InterfaceType.I2C_TCA9534.value]} ({InterfaceType.I2C_TCA9534.value})")
+                menu(
+                    "Digital channels on IoTextra Combo require a digital interface:",
+                    f"1. {DIGITAL_INTERFACE_LABELS[InterfaceType.GPIO.value]} ({InterfaceType.GPIO.value})",
+                    f"2. {DIGITAL_INTERFACE_LABELS[InterfaceType.I2C_TCA9534.value]} ({InterfaceType.I2C_TCA9534.value})",
+                )
                 while True:
-                    choice = input("Select interface type for this digital channel (1-2): ").strip()
+                    choice = prompt("Select interface type for this digital channel (1-2): ").strip()
                     if choice == "1":
                         interface_type = InterfaceType.GPIO.value
                         break
@@ -795,37 +1061,32 @@ class Configurator:
                 interface_type = "01"
             else:
                 # Allow manual selection if configuration was switched after creation
-                print("Analog interface types available:")
-                for idx, (code, label) in enumerate(((code, ANALOG_INTERFACE_LABELS[code]) for code in ANALOG_INTERFACE_LABELS), 1):
-                    print(f"{idx}. {label} ({code})")
+                menu("Analog interface types available:", *(
+                    f"{idx}. {label} ({code})"
+                    for idx, (code, label) in enumerate(ANALOG_INTERFACE_LABELS.items(), 1)
+                ))
                 while True:
                     try:
-                        choice = int(input("Select analog interface type: ")) - 1
-                        codes = list(ANALOG_INTERFACE_LABELS.keys())
-                        if 0 <= choice < len(codes):
-                            interface_type = codes[choice]
+                        choice = int(prompt("Select analog interface type: ")) - 1
+                        if 0 <= choice < len(ANALOG_INTERFACE_MENU_CODES):
+                            interface_type = ANALOG_INTERFACE_MENU_CODES[choice]
                             break
                     except ValueError:
                         pass
-                    print(f"Please select 1-{len(ANALOG_INTERFACE_LABELS)}.")
+                    print(f"Please select 1-{len(ANALOG_INTERFACE_MENU_CODES)}.")
 
         # Channel number selection
-        used_numbers = [ch.channel_number for ch in self.config.channels]
-        if channel_type == ChannelType.BIT.value:
-            number_range = range(8)
-        else:
-            number_range = range(8)
-
-        available_numbers = [i for i in number_range if i not in used_numbers]
+        available_numbers = self._available_channel_numbers()
         if not available_numbers:
             print("No available channel numbers remain for this channel type.")
             return
 
+        available_set = set(available_numbers)
         print(f"Available channel numbers: {available_numbers}")
         while True:
             try:
-                channel_number = int(input(f"Channel number ({available_numbers[0]}-{available_numbers[-1]}): "))
-                if channel_number in available_numbers:
+                channel_number = int(prompt(f"Channel number ({available_numbers[0]}-{available_numbers[-1]}): "))
+                if channel_number in available_set:
                     break
                 else:
                     print(f"Please select from available numbers: {available_numbers}")
@@ -834,19 +1095,19 @@ class Configurator:
 
         # Actions / measurement range
         if channel_type == ChannelType.BIT.value:
-            print("Channel actions:")
-            print("0. Read only")
-            print("1. Read + Write")
+            menu("Channel actions:", "0. Read only", "1. Read + Write")
             while True:
                 try:
-                    actions = int(input("Select actions (0-1): "))
+                    actions = int(prompt("Select actions (0-1): "))
                     if actions in [0, 1]:
                         break
                     else:
                         print("Please select 0 or 1.")
                 except ValueError:
                     print("Please enter a valid number.")
+            # ADC calibration fields are only set for analog channels
             measurement_range = None
+            adc_hardware_gain = shunt_resistance = adc_offset = None
         else:
             actions = 0
             print("Analog input channels are read-only. Actions set to 0 (Read).")
@@ -855,13 +1116,15 @@ class Configurator:
             # Prompt per-channel ADC calibration values (defaults come from module defaults)
             # adc_hardware_gain
             default_gain = DEFAULT_ADC_HARDWARE_GAIN
-            print("\n--- ADC Hardware Gain Settings ---")
-            print("Select the division factor (hardware gain) for this channel (set by jumpers):")
-            print(f"  Default: two 49.9kΩ resistors in parallel -> K ≈ {DEFAULT_ADC_HARDWARE_GAIN:.4f} ({DEFAULT_ADC_HARDWARE_GAIN})")
-            print(f"  Modified: one 49.9kΩ resistor -> K ≈ {0.47523809523809524:.4f} ({0.47523809523809524}) — requires changing jumpers")
-            print(f"  IoTextra Analog V1 Boards Have a gain of K ≈ 0.2")
-            print(f"  Custom: You can enter your own value if your making custom modifications different from above.")
-            gain_input = input(f"\nEnter ADC hardware gain K (division factor) (default: {default_gain}): ").strip()
+            menu(
+                "\n--- ADC Hardware Gain Settings ---",
+                "Select the division factor (hardware gain) for this channel (set by jumpers):",
+                f"  Default: two 49.9kΩ resistors in parallel -> K ≈ {DEFAULT_ADC_HARDWARE_GAIN:.4f} ({DEFAULT_ADC_HARDWARE_GAIN})",
+                f"  Modified: one 49.9kΩ resistor -> K ≈ {0.47523809523809524:.4f} ({0.47523809523809524}) — requires changing jumpers",
+                "  IoTextra Analog V1 Boards Have a gain of K ≈ 0.2",
+                "  Custom: You can enter your own value if your making custom modifications different from above.",
+            )
+            gain_input = prompt(f"\nEnter ADC hardware gain K (division factor) (default: {default_gain}): ").strip()
             if gain_input:
                 try:
                     adc_hardware_gain = float(gain_input)
@@ -873,12 +1136,14 @@ class Configurator:
 
             # shunt_resistance
             default_shunt = DEFAULT_SHUNT_RESISTANCE
-            print("\n--- Current Shunt Resistance Settings ---")
-            print(f"Select the shunt resistance value used in your hardware (in Ohms).")
-            print(f"  Example: 0.12 = 120 Ohms, 0.249 = 249 Ohms")
-            print(f"  IoTextra Analog V1 Boards use a 120 Ohm shunt which you can measure using a multimeter.")
-            print(f"  You can set a different value according to your hardware setup of your IoTextra module.")
-            shunt_input = input(f"\nShunt resistance in Ohms (default: {default_shunt}): ").strip()
+            menu(
+                "\n--- Current Shunt Resistance Settings ---",
+                "Select the shunt resistance value used in your hardware (in Ohms).",
+                "  Example: 0.12 = 120 Ohms, 0.249 = 249 Ohms",
+                "  IoTextra Analog V1 Boards use a 120 Ohm shunt which you can measure using a multimeter.",
+                "  You can set a different value according to your hardware setup of your IoTextra module.",
+            )
+            shunt_input = prompt(f"\nShunt resistance in Ohms (default: {default_shunt}): ").strip()
             if shunt_input:
                 try:
                     shunt_resistance = float(shunt_input)
@@ -890,10 +1155,12 @@ class Configurator:
 
             # adc_offset
             default_offset = DEFAULT_ADC_OFFSET
-            print("\n--- ADC Offset Settings ---")
-            print(f"Set the ADC offset in volts for this channel (can be negative).")
-            print(f"  This compensates for any systematic offset in your measurements.")
-            offset_input = input(f"\nADC offset in volts (can be negative) (default: {default_offset}): ").strip()
+            menu(
+                "\n--- ADC Offset Settings ---",
+                "Set the ADC offset in volts for this channel (can be negative).",
+                "  This compensates for any systematic offset in your measurements.",
+            )
+            offset_input = prompt(f"\nADC offset in volts (can be negative) (default: {default_offset}): ").strip()
             if offset_input:
                 try:
                     adc_offset = float(offset_input)
@@ -905,16 +1172,6 @@ class Configurator:
 
         # Create and add channel
         try:
-            # Ensure ADC calibration fields are only set for analog channels
-            if channel_type == ChannelType.BIT.value:
-                adc_hardware_gain = None
-                shunt_resistance = None
-                adc_offset = None
-            else:
-                adc_hardware_gain = locals().get('adc_hardware_gain', None)
-                shunt_resistance = locals().get('shunt_resistance', None)
-                adc_offset = locals().get('adc_offset', None)
-
             channel = Channel(
                 name=name,
                 channel_type=channel_type,
@@ -926,11 +1183,111 @@ class Configurator:
                 shunt_resistance=shunt_resistance,
                 adc_offset=adc_offset,
             )
-            self.config.channels.append(channel)
+            self.config.add_channel(channel)
             print(f"\nChannel '{name}' added successfully!")
         except ValueError as e:
             print(f"Error creating channel: {e}")
     
+    def add_channels_from_spec(self, path: str) -> bool:
+        """Add channels from a JSON list of channel specs without prompting.
+
+        Lines starting with '#' are treated as comments. Missing fields fall back
+        to the same defaults as the interactive flow; the batch is rejected as a
+        whole if any entry is invalid.
+        """
+        try:
+            with open(path, 'r') as f:
+                text = "".join(line for line in f if not line.lstrip().startswith('#'))
+            specs = json_decode(text)
+            if not isinstance(specs, list):
+                raise ValueError("Channel spec must be a JSON list")
+
+            if len(self.config.channels) + len(specs) > 8:
+                raise ValueError(f"Maximum 8 channels allowed, configuration already has {len(self.config.channels)}")
+
+            if self.config.mezzanine_type == "IoTextra Combo":
+                allowed_types = {code for code, _ in COMBO_CHANNEL_TYPE_OPTIONS}
+            elif self.is_analog_module:
+                allowed_types = {code for code, _ in ANALOG_CHANNEL_TYPE_OPTIONS}
+            else:
+                allowed_types = {code for code, _ in DIGITAL_CHANNEL_TYPE_OPTIONS}
+            default_type = ChannelType.ANALOG_INT.value if self.is_analog_module else ChannelType.BIT.value
+
+            names = {ch.name for ch in self.config.channels}
+            used_numbers = {ch.channel_number for ch in self.config.channels}
+            new_channels = []
+            for idx, spec in enumerate(specs, 1):
+                if not isinstance(spec, dict):
+                    raise ValueError(f"Entry {idx}: expected an object")
+                name = spec.get('name', '')
+                channel_type = spec.get('channel_type', default_type)
+                channel_number = spec.get('channel_number')
+                actions = spec.get('actions', 0)
+                if not isinstance(name, str) or not 1 <= len(name) <= 8:
+                    raise ValueError(f"Entry {idx}: channel name must be 1-8 characters long")
+                # bool is an int subclass, so JSON true/false would otherwise pass as 1/0
+                if isinstance(channel_number, bool) or not isinstance(channel_number, int):
+                    raise ValueError(f"Entry {idx}: channel_number is required")
+                if isinstance(actions, bool) or not isinstance(actions, int):
+                    raise ValueError(f"Entry {idx}: actions must be an integer")
+                if channel_type not in allowed_types:
+                    raise ValueError(f"Entry {idx}: channel type {channel_type} is not available on {self.config.mezzanine_type}")
+                if name in names:
+                    raise ValueError(f"Entry {idx}: channel name '{name}' already exists")
+                if channel_number in used_numbers:
+                    raise ValueError(f"Entry {idx}: channel number {channel_number} is already used")
+
+                interface_type = spec.get('interface_type')
+                if channel_type == ChannelType.BIT.value:
+                    if interface_type is None:
+                        if self.config.mezzanine_type == "IoTextra Combo":
+                            raise ValueError(f"Entry {idx}: digital channels on IoTextra Combo require an interface_type")
+                        interface_type = InterfaceType.GPIO.value
+                    channel = Channel(
+                        name=name,
+                        channel_type=channel_type,
+                        interface_type=interface_type,
+                        channel_number=channel_number,
+                        actions=actions,
+                    )
+                else:
+                    if interface_type is None:
+                        if self.is_analog_module and self.config.mezzanine_type == "IoTextra Combo":
+                            interface_type = "21"
+                        elif self.is_analog_module:
+                            interface_type = "01"
+                        else:
+                            raise ValueError(f"Entry {idx}: analog channels require an interface_type")
+                    gain = spec.get('adc_hardware_gain')
+                    shunt = spec.get('shunt_resistance')
+                    offset = spec.get('adc_offset')
+                    channel = Channel(
+                        name=name,
+                        channel_type=channel_type,
+                        interface_type=interface_type,
+                        channel_number=channel_number,
+                        actions=0,
+                        measurement_range=spec.get('measurement_range'),
+                        adc_hardware_gain=DEFAULT_ADC_HARDWARE_GAIN if gain is None else gain,
+                        shunt_resistance=DEFAULT_SHUNT_RESISTANCE if shunt is None else shunt,
+                        adc_offset=DEFAULT_ADC_OFFSET if offset is None else offset,
+                    )
+                names.add(name)
+                used_numbers.add(channel_number)
+                new_channels.append(channel)
+        except FileNotFoundError:
+            print(f"File not found: {path}")
+            return False
+        except (ValueError, TypeError) as e:
+            print(f"Error in channel spec {path}: {e}")
+            return False
+
+        for channel in new_channels:
+            self.config.add_channel(channel)
+        self._config_payload = None
+        print(f"Added {len(new_channels)} channel(s) from: {path}")
+        return True
+
     def edit_channel(self):
         """Edit an existing channel"""
         if not self.config.channels:
@@ -940,7 +1297,7 @@ class Configurator:
         self.view_channels()
         while True:
             try:
-                choice = int(input("\nEnter channel number to edit (1-{}): ".format(len(self.config.channels)))) - 1
+                choice = int(prompt("\nEnter channel number to edit (1-{}): ".format(len(self.config.channels)))) - 1
                 if 0 <= choice < len(self.config.channels):
                     break
                 else:
@@ -953,23 +1310,25 @@ class Configurator:
         
         # Edit channel properties
         while True:
-            print(f"\nCurrent channel: {channel.name}")
             if channel.channel_type == ChannelType.BIT.value:
-                print("1. Change name")
-                print("2. Change interface type")
-                print("3. Change channel number")
-                print("4. Change actions")
-                print("5. Done")
-                action = input("Select action (1-5): ").strip()
+                menu(
+                    f"\nCurrent channel: {channel.name}",
+                    "1. Change name",
+                    "2. Change interface type",
+                    "3. Change channel number",
+                    "4. Change actions",
+                    "5. Done",
+                )
+                action = prompt("Select action (1-5): ").strip()
 
                 if action == "1":
                     while True:
-                        new_name = input("New channel name (max 8 chars): ").strip()
+                        new_name = prompt("New channel name (max 8 chars): ").strip()
                         if len(new_name) <= 8 and new_name:
-                            if any(ch.name == new_name for ch in self.config.channels if ch != channel):
+                            if new_name != channel.name and self.config.has_channel_name(new_name):
                                 print("Channel name already exists. Please choose a different name.")
                                 continue
-                            channel.name = new_name
+                            self.config.rename_channel(channel, new_name)
                             print(f"Channel name changed to: {new_name}")
                             break
                         else:
@@ -978,11 +1337,13 @@ class Configurator:
                 elif action == "2":
                     # Digital channels on combo mezzanines can choose GPIO or I2C
                     if self.config.mezzanine_type == "IoTextra Combo":
-                        print("Digital channels on IoTextra Combo can use:")
-                        print(f"1. {DIGITAL_INTERFACE_LABELS[InterfaceType.GPIO.value]} ({InterfaceType.GPIO.value})")
-                        print(f"2. {DIGITAL_INTERFACE_LABELS[InterfaceType.I2C_TCA9534.value]} ({InterfaceType.I2C_TCA9534.value})")
+                        menu(
+                            "Digital channels on IoTextra Combo can use:",
+                            f"1. {DIGITAL_INTERFACE_LABELS[InterfaceType.GPIO.value]} ({InterfaceType.GPIO.value})",
+                            f"2. {DIGITAL_INTERFACE_LABELS[InterfaceType.I2C_TCA9534.value]} ({InterfaceType.I2C_TCA9534.value})",
+                        )
                         while True:
-                            choice = input("Select interface type for this digital channel (1-2): ").strip()
+                            choice = prompt("Select interface type for this digital channel (1-2): ").strip()
                             if choice == "1":
                                 channel.interface_type = InterfaceType.GPIO.value
                                 print("Interface type changed to GPIO")
@@ -1002,16 +1363,14 @@ class Configurator:
                     
 
                 elif action == "3":
-                    used_numbers = [ch.channel_number for ch in self.config.channels if ch != channel]
-                    available_numbers = [i for i in range(8) if i not in used_numbers]
-                    available_numbers.append(channel.channel_number)
-                    available_numbers = sorted(set(available_numbers))
+                    available_numbers = self._available_channel_numbers(excluding=channel)
+                    available_set = set(available_numbers)
 
                     print(f"Available channel numbers: {available_numbers}")
                     while True:
                         try:
-                            new_number = int(input("New channel number (0-7): "))
-                            if new_number in available_numbers:
+                            new_number = int(prompt("New channel number (0-7): "))
+                            if new_number in available_set:
                                 channel.channel_number = new_number
                                 print(f"Channel number changed to: {new_number}")
                                 break
@@ -1021,12 +1380,10 @@ class Configurator:
                             print("Please enter a valid number.")
 
                 elif action == "4":
-                    print("Channel actions:")
-                    print("0. Read only")
-                    print("1. Read + Write")
+                    menu("Channel actions:", "0. Read only", "1. Read + Write")
                     while True:
                         try:
-                            new_actions = int(input("Select actions (0-1): "))
+                            new_actions = int(prompt("Select actions (0-1): "))
                             if new_actions in [0, 1]:
                                 channel.actions = new_actions
                                 print(f"Actions changed to: {new_actions}")
@@ -1042,22 +1399,25 @@ class Configurator:
                     print("Invalid choice. Please select 1-5.")
 
             else:
-                print("1. Change name")
-                print("2. Change interface type")
-                print("3. Change channel number")
-                print("4. Change measurement range")
-                print("5. Change ADC calibration (gain / shunt / offset)")
-                print("6. Done")
-                action = input("Select action (1-6): ").strip()
+                menu(
+                    f"\nCurrent channel: {channel.name}",
+                    "1. Change name",
+                    "2. Change interface type",
+                    "3. Change channel number",
+                    "4. Change measurement range",
+                    "5. Change ADC calibration (gain / shunt / offset)",
+                    "6. Done",
+                )
+                action = prompt("Select action (1-6): ").strip()
 
                 if action == "1":
                     while True:
-                        new_name = input("New channel name (max 8 chars): ").strip()
+                        new_name = prompt("New channel name (max 8 chars): ").strip()
                         if len(new_name) <= 8 and new_name:
-                            if any(ch.name == new_name for ch in self.config.channels if ch != channel):
+                            if new_name != channel.name and self.config.has_channel_name(new_name):
                                 print("Channel name already exists. Please choose a different name.")
                                 continue
-                            channel.name = new_name
+                            self.config.rename_channel(channel, new_name)
                             print(f"Channel name changed to: {new_name}")
                             break
                         else:
@@ -1066,14 +1426,14 @@ class Configurator:
                 elif action == "2":
                     if self.is_analog_module:
                         print("Analog interface types available:")
-                        codes = list(ANALOG_INTERFACE_LABELS.keys())
+                        codes = ANALOG_INTERFACE_MENU_CODES
                         for idx, code in enumerate(codes, 1):
                             label = ANALOG_INTERFACE_LABELS[code]
                             marker = " (current)" if channel.interface_type == code else ""
                             print(f"{idx}. {label} ({code}){marker}")
                         while True:
                             try:
-                                selection = int(input("Select analog interface type: ")) - 1
+                                selection = int(prompt("Select analog interface type: ")) - 1
                                 if 0 <= selection < len(codes):
                                     channel.interface_type = codes[selection]
                                     print(f"Interface type changed to {ANALOG_INTERFACE_LABELS[channel.interface_type]}")
@@ -1085,16 +1445,14 @@ class Configurator:
                         print("Interface type is fixed for this configuration.")
 
                 elif action == "3":
-                    used_numbers = [ch.channel_number for ch in self.config.channels if ch != channel]
-                    available_numbers = [i for i in range(8) if i not in used_numbers]
-                    available_numbers.append(channel.channel_number)
-                    available_numbers = sorted(set(available_numbers))
+                    available_numbers = self._available_channel_numbers(excluding=channel)
+                    available_set = set(available_numbers)
 
                     print(f"Available channel numbers: {available_numbers}")
                     while True:
                         try:
-                            new_number = int(input("New channel number (0-7): "))
-                            if new_number in available_numbers:
+                            new_number = int(prompt("New channel number (0-7): "))
+                            if new_number in available_set:
                                 channel.channel_number = new_number
                                 print(f"Channel number changed to: {new_number}")
                                 break
@@ -1108,11 +1466,13 @@ class Configurator:
 
                 elif action == "5":
                     # Edit per-channel ADC calibration
-                    print(f"Current ADC gain K: {channel.adc_hardware_gain}")
-                    print("Select the division factor (hardware gain) for this channel (set by jumpers):")
-                    print(f"  Default: two 49.9kΩ resistors in parallel -> K ≈ {DEFAULT_ADC_HARDWARE_GAIN:.4f} ({DEFAULT_ADC_HARDWARE_GAIN})")
-                    print(f"  Modified: one 49.9kΩ resistor -> K ≈ {0.47523809523809524:.4f} ({0.47523809523809524}) — requires changing jumpers")
-                    gain_input = input("New ADC hardware gain K (or enter to keep current): ").strip()
+                    menu(
+                        f"Current ADC gain K: {channel.adc_hardware_gain}",
+                        "Select the division factor (hardware gain) for this channel (set by jumpers):",
+                        f"  Default: two 49.9kΩ resistors in parallel -> K ≈ {DEFAULT_ADC_HARDWARE_GAIN:.4f} ({DEFAULT_ADC_HARDWARE_GAIN})",
+                        f"  Modified: one 49.9kΩ resistor -> K ≈ {0.47523809523809524:.4f} ({0.47523809523809524}) — requires changing jumpers",
+                    )
+                    gain_input = prompt("New ADC hardware gain K (or enter to keep current): ").strip()
                     if gain_input:
                         try:
                             channel.adc_hardware_gain = float(gain_input)
@@ -1121,7 +1481,7 @@ class Configurator:
                             print("Invalid value, keeping current.")
 
                     print(f"Current shunt resistance (Ohm): {channel.shunt_resistance}")
-                    sh_input = input("New shunt resistance in Ohms (or enter to keep current): ").strip()
+                    sh_input = prompt("New shunt resistance in Ohms (or enter to keep current): ").strip()
                     if sh_input:
                         try:
                             channel.shunt_resistance = float(sh_input)
@@ -1130,7 +1490,7 @@ class Configurator:
                             print("Invalid value, keeping current.")
 
                     print(f"Current ADC offset (V): {channel.adc_offset}")
-                    off_input = input("New ADC offset in volts (or enter to keep current): ").strip()
+                    off_input = prompt("New ADC offset in volts (or enter to keep current): ").strip()
                     if off_input:
                         try:
                             channel.adc_offset = float(off_input)
@@ -1152,12 +1512,12 @@ class Configurator:
         self.view_channels()
         while True:
             try:
-                choice = int(input("\nEnter channel number to remove (1-{}): ".format(len(self.config.channels)))) - 1
+                choice = int(prompt("\nEnter channel number to remove (1-{}): ".format(len(self.config.channels)))) - 1
                 if 0 <= choice < len(self.config.channels):
                     channel = self.config.channels[choice]
-                    confirm = input(f"Are you sure you want to remove channel '{channel.name}'? (y/n): ").strip().lower()
+                    confirm = prompt(f"Are you sure you want to remove channel '{channel.name}'? (y/n): ").strip().lower()
                     if confirm in ['y', 'yes']:
-                        removed = self.config.channels.pop(choice)
+                        removed = self.config.remove_channel(choice)
                         print(f"Channel '{removed.name}' removed successfully!")
                     break
                 else:
@@ -1171,10 +1531,11 @@ class Configurator:
             print("No channels configured.")
             return
         
-        print("\n--- Configured Channels ---")
-        print(f"{'#':<2} {'Name':<10} {'Type':<6} {'Interface':<20} {'Channel':<7} {'Actions':<12} {'Range':<20}")
-        print("-" * 85)
-        
+        rows = [
+            "\n--- Configured Channels ---",
+            f"{'#':<2} {'Name':<10} {'Type':<6} {'Interface':<20} {'Channel':<7} {'Actions':<12} {'Range':<20}",
+            "-" * 85,
+        ]
         for i, channel in enumerate(self.config.channels, 1):
             if channel.channel_type == ChannelType.BIT.value:
                 interface_desc = DIGITAL_INTERFACE_LABELS.get(channel.interface_type, channel.interface_type)
@@ -1194,11 +1555,27 @@ class Configurator:
                     details.append(f"Offset={channel.adc_offset}V")
                 if details:
                     range_desc = f"{range_desc} ({', '.join(details)})"
-            print(
+            rows.append(
                 f"{i:<2} {channel.name:<10} {CHANNEL_TYPE_LABELS.get(channel.channel_type, channel.channel_type):<6} "
                 f"{interface_desc:<20} {channel.channel_number:<7} {actions_desc:<12} {range_desc:<20}"
             )
+        menu(*rows)
     
+    def _config_json_dict(self) -> Dict[str, Any]:
+        """Return the configuration as the JSON document shared by config files and the device"""
+        config_dict = self.config.to_dict()
+        hardware_dict = config_dict['hardware']
+
+        # Convert the fixed-size ADC address slots to a compact list for JSON
+        # JSON will include 'adc_i2c_addrs': [addr1, addr2, ...] if any addresses are present
+        adc_addrs = hardware_dict.pop('adc_i2c_addresses', [])
+        addrs_list = [a for a in adc_addrs if a]
+
+        if addrs_list:
+            hardware_dict['adc_i2c_addrs'] = addrs_list
+
+        return config_dict
+
     def save_config(self, filename: str = None):
         """Save configuration to JSON file"""
         if not self.config:
@@ -1206,7 +1583,7 @@ class Configurator:
             return False
         
         if not filename:
-            filename = input("Enter filename to save (default: config.json): ").strip()
+            filename = prompt("Enter filename to save (default: config.json): ").strip()
             if not filename:
                 filename = "config.json"
         
@@ -1214,59 +1591,8 @@ class Configurator:
             filename += '.json'
         
         try:
-            # Convert configuration to dictionary
-            hardware_dict = asdict(self.config.hardware)
-            
-            # Convert ADC addresses dictionary to a list for JSON compatibility
-            # JSON will include 'adc_i2c_addrs': [addr1, addr2, ...] if any addresses are present
-            adc_addrs = hardware_dict.pop('adc_i2c_addresses', {})
-            addrs_list = []
-            if isinstance(adc_addrs, dict):
-                # Build ordered list by ADC number
-                for i in sorted(adc_addrs.keys()):
-                    if adc_addrs[i]:
-                        addrs_list.append(adc_addrs[i])
-            elif isinstance(adc_addrs, list):
-                addrs_list = [a for a in adc_addrs if a]
-
-            if addrs_list:
-                hardware_dict['adc_i2c_addrs'] = addrs_list
-            
-            config_dict = {
-                'module_type': self.config.module_type,
-                'mezzanine_type': self.config.mezzanine_type,
-                'channels': [],
-                'network': asdict(self.config.network),
-                'mqtt': asdict(self.config.mqtt),
-                'hardware': hardware_dict,
-                'pin_config': self.config.pin_config,
-                'status_update_interval_s': self.config.status_update_interval_s
-            }
-            
-            for channel in self.config.channels:
-                channel_dict = asdict(channel)
-                # Remove analog-only keys for digital channels, and drop None values
-                if channel.channel_type == ChannelType.BIT.value:
-                    channel_dict.pop('measurement_range', None)
-                    channel_dict.pop('adc_hardware_gain', None)
-                    channel_dict.pop('shunt_resistance', None)
-                    channel_dict.pop('adc_offset', None)
-                else:
-                    # analog channel: remove measurement_range only if None
-                    if channel_dict.get('measurement_range') is None:
-                        channel_dict.pop('measurement_range', None)
-                    # remove adc fields if None to keep JSON clean
-                    if channel_dict.get('adc_hardware_gain') is None:
-                        channel_dict.pop('adc_hardware_gain', None)
-                    if channel_dict.get('shunt_resistance') is None:
-                        channel_dict.pop('shunt_resistance', None)
-                    if channel_dict.get('adc_offset') is None:
-                        channel_dict.pop('adc_offset', None)
-
-                config_dict['channels'].append(channel_dict)
-            
-            with open(filename, 'w') as f:
-                json.dump(config_dict, f, indent=2)
+            with open(filename, 'wb') as f:
+                f.write(json_encode_pretty(self._config_json_dict()))
             
             print(f"Configuration saved to: {filename}")
             self.config_file = filename
@@ -1279,61 +1605,32 @@ class Configurator:
     def load_config(self, filename: str = None):
         """Load configuration from JSON file"""
         if not filename:
-            filename = input("Enter filename to load: ").strip()
+            filename = prompt("Enter filename to load: ").strip()
         
         if not filename.endswith('.json'):
             filename += '.json'
         
         try:
-            with open(filename, 'r') as f:
-                config_dict = json.load(f)
+            with open(filename, 'rb') as f:
+                config_dict = json_decode(f.read())
             
-            # Reconstruct configuration object
-            channels = []
-            for ch_data in config_dict.get('channels', []):
-                channel = Channel(
-                    name=ch_data['name'],
-                    channel_type=ch_data['channel_type'],
-                    interface_type=ch_data['interface_type'],
-                    channel_number=ch_data['channel_number'],
-                    actions=ch_data['actions'],
-                    measurement_range=ch_data.get('measurement_range'),
-                    adc_hardware_gain=ch_data.get('adc_hardware_gain'),
-                    shunt_resistance=ch_data.get('shunt_resistance'),
-                    adc_offset=ch_data.get('adc_offset'),
-                )
-                channels.append(channel)
-
-            # Process hardware config to convert ADC addresses from JSON formats to internal dictionary
+            # Process hardware config to convert ADC addresses from JSON formats to internal slots
             hardware_data = config_dict['hardware'].copy()
 
-            # If a new-style list is present (adc_i2c_addrs), convert to dict {1: addr, 2: addr}
+            # If a new-style list is present (adc_i2c_addrs), use it as the ADC 1..N slots
             if 'adc_i2c_addrs' in hardware_data:
                 addrs_list = hardware_data.pop('adc_i2c_addrs')
-                try:
-                    if isinstance(addrs_list, list):
-                        adc_addresses = {i+1: addrs_list[i] for i in range(len(addrs_list)) if addrs_list[i]}
-                    else:
-                        adc_addresses = {}
-                except Exception:
-                    adc_addresses = {}
-                if adc_addresses:
-                    hardware_data['adc_i2c_addresses'] = adc_addresses
+                if isinstance(addrs_list, list):
+                    hardware_data['adc_i2c_addresses'] = [a or None for a in addrs_list]
             else:
                 adc_addresses = {}
                 # Check for various ADC address field formats (legacy keys)
                 # Iterate over a static list of keys to avoid "dictionary changed size during iteration"
                 for key in list(hardware_data.keys()):
-                    value = hardware_data[key]
-                    # Handle formats like "adc_1_i2c_addr", "ADC1_I2C_ADDR", "adc1_i2c_addr"
-                    if 'adc' in key.lower() and 'i2c' in key.lower() and 'addr' in key.lower():
-                        # Extract ADC number from key
-                        match = re.search(r'(\d+)', key)
-                        if match:
-                            adc_num = int(match.group(1))
-                            adc_addresses[adc_num] = value
-                            # Remove the original per-ADC key from hardware_data
-                            hardware_data.pop(key, None)
+                    match = ADC_ADDR_KEY_RE.fullmatch(key)
+                    if match:
+                        # Move the per-ADC key into the address mapping
+                        adc_addresses[int(match.group(1))] = hardware_data.pop(key)
 
                 # Set the ADC addresses dictionary if we found legacy fields
                 if adc_addresses:
@@ -1344,15 +1641,23 @@ class Configurator:
             hw_shunt = hardware_data.pop('shunt_resistance', None)
             hw_offset = hardware_data.pop('adc_offset', None)
 
-            # If channels don't specify per-channel calibration, set them from hardware-level or module defaults
-            for ch in channels:
-                if ch.channel_type == ChannelType.ANALOG_INT.value:
-                    if ch.adc_hardware_gain is None:
-                        ch.adc_hardware_gain = hw_gain if hw_gain is not None else DEFAULT_ADC_HARDWARE_GAIN
-                    if ch.shunt_resistance is None:
-                        ch.shunt_resistance = hw_shunt if hw_shunt is not None else DEFAULT_SHUNT_RESISTANCE
-                    if ch.adc_offset is None:
-                        ch.adc_offset = hw_offset if hw_offset is not None else DEFAULT_ADC_OFFSET
+            calibration_defaults = {
+                'adc_hardware_gain': hw_gain if hw_gain is not None else DEFAULT_ADC_HARDWARE_GAIN,
+                'shunt_resistance': hw_shunt if hw_shunt is not None else DEFAULT_SHUNT_RESISTANCE,
+                'adc_offset': hw_offset if hw_offset is not None else DEFAULT_ADC_OFFSET,
+            }
+
+            # Reconstruct channels, filling in missing per-channel calibration from
+            # hardware-level or module defaults before construction so each channel
+            # is validated exactly once with its final values.
+            channels = []
+            for ch_data in config_dict.get('channels', []):
+                if ch_data.get('channel_type') == ChannelType.ANALOG_INT.value:
+                    ch_data = dict(ch_data)
+                    for key, default in calibration_defaults.items():
+                        if ch_data.get(key) is None:
+                            ch_data[key] = default
+                channels.append(Channel.from_dict(ch_data))
 
             # Construct Configuration without a top-level interface_type; channel
             # objects contain per-channel interface codes. Determine whether this
@@ -1379,6 +1684,7 @@ class Configurator:
             
             print(f"Configuration loaded from: {filename}")
             self.config_file = filename
+            self._config_payload = None
             return True
             
         except FileNotFoundError:
@@ -1419,8 +1725,9 @@ class Configurator:
         if self.config.hardware.num_of_adcs > 0:
             print(f"\nADC Configuration:")
             print(f"Number of ADCs: {self.config.hardware.num_of_adcs}")
-            for adc_num in sorted(self.config.hardware.adc_i2c_addresses.keys()):
-                print(f"  ADC {adc_num} I2C Address: {self.config.hardware.adc_i2c_addresses[adc_num]}")
+            for adc_num, addr in enumerate(self.config.hardware.adc_i2c_addresses, 1):
+                if addr:
+                    print(f"  ADC {adc_num} I2C Address: {addr}")
         
         print("\nGPIO Host Pin Configuration:")
         for channel, pin in self.config.hardware.gpio_host_pins.items():
@@ -1430,97 +1737,47 @@ class Configurator:
     
     # export_eeprom_format removed: EEPROM export functionality deprecated/removed
 
+    def _build_config_payload(self) -> bytes:
+        """Serialize the configuration into the framed message sent to the device"""
+        return frame_message(json_encode(self._config_json_dict()))
+
     def send_to_pi(self):
         """Send the current configuration to the Raspberry Pi Pico over serial."""
         if not self.config:
             print("No configuration loaded. Please create or load one first.")
             return False
 
-        port = input("Enter serial port (default: /dev/cu.usbmodem2101): ").strip() or "/dev/cu.usbmodem2101"
+        serial = import_serial()
+        if serial is None:
+            return False
+
+        port = prompt("Enter serial port (default: /dev/cu.usbmodem2101): ").strip() or "/dev/cu.usbmodem2101"
         baudrate = 115200
 
         try:
-            serial_connection = serial.Serial(port, baudrate)
+            serial_connection = serial.Serial(port, baudrate, timeout=SERIAL_READ_TIMEOUT_S)
         except serial.SerialException as e:
             print(f"Failed to open serial port {port}: {e}")
             return False
 
         try:
-            # Serialize configuration to JSON
-            hardware_dict = asdict(self.config.hardware)
-            
-            # Convert ADC addresses dictionary to a list for JSON compatibility
-            adc_addrs = hardware_dict.pop('adc_i2c_addresses', {})
-            addrs_list = []
-            if isinstance(adc_addrs, dict):
-                for i in sorted(adc_addrs.keys()):
-                    if adc_addrs[i]:
-                        addrs_list.append(adc_addrs[i])
-            elif isinstance(adc_addrs, list):
-                addrs_list = [a for a in adc_addrs if a]
-
-            if addrs_list:
-                hardware_dict['adc_i2c_addrs'] = addrs_list
-            
-            # Build channels list similarly to save_config (clean digital/None-only fields)
-            channels_list = []
-            for ch in self.config.channels:
-                ch_dict = asdict(ch)
-                if ch.channel_type == ChannelType.BIT.value:
-                    # remove analog-only keys
-                    ch_dict.pop('measurement_range', None)
-                    ch_dict.pop('adc_hardware_gain', None)
-                    ch_dict.pop('shunt_resistance', None)
-                    ch_dict.pop('adc_offset', None)
-                else:
-                    if ch_dict.get('measurement_range') is None:
-                        ch_dict.pop('measurement_range', None)
-                    if ch_dict.get('adc_hardware_gain') is None:
-                        ch_dict.pop('adc_hardware_gain', None)
-                    if ch_dict.get('shunt_resistance') is None:
-                        ch_dict.pop('shunt_resistance', None)
-                    if ch_dict.get('adc_offset') is None:
-                        ch_dict.pop('adc_offset', None)
-                channels_list.append(ch_dict)
-
-            config_dict = {
-                'module_type': self.config.module_type,
-                'mezzanine_type': self.config.mezzanine_type,
-                'channels': channels_list,
-                'network': asdict(self.config.network),
-                'mqtt': asdict(self.config.mqtt),
-                'hardware': hardware_dict,
-                'pin_config': self.config.pin_config,
-                'status_update_interval_s': self.config.status_update_interval_s
-            }
-            json_data = json.dumps(config_dict)
-            message = f"<START>{json_data}<END>\n"
-            #print(message)  # For debugging
+            # Serialize configuration to JSON (reused until the configuration changes)
+            if self._config_payload is None:
+                self._config_payload = self._build_config_payload()
+            #print(self._config_payload)  # For debugging
 
-            serial_connection.write(message.encode())
+            serial_connection.write(self._config_payload)
             serial_connection.flush()
             print(f"Configuration sent to Pi on {port}")
             print("Please wait 20 seconds...")
-            # Wait for and read response
-            buffer = ""
-            timeout = 20  # Wait up to 20 seconds for a response
-            start_time = time.time()
-
-            while time.time() - start_time < timeout:
-                if serial_connection.in_waiting > 0:
-                    char = serial_connection.read(1).decode()
-                    buffer += char
-                    if "<START>" in buffer and "<END>" in buffer:
-                        start = buffer.find("<START>") + len("<START>")
-                        end = buffer.find("<END>")
-                        json_str = buffer[start:end]
-                        try:
-                            received_data = json.loads(json_str)
-                            print("Received data:", received_data)
-                        except json.JSONDecodeError as e:
-                            print("Failed to parse response JSON:", e)
-                        buffer = buffer[end + len("<END>"):]  # Clear processed part
-                        break
+            # Wait up to 20 seconds for a response
+            payload, _ = read_framed_response(serial_connection, 20)
+            if payload is not None:
+                try:
+                    received_data = json_decode(payload)
+                    print("Received data:", received_data)
+                except ValueError as e:
+                    print("Failed to parse response JSON:", e)
             return True
         except Exception as e:
             print(f"Error sending configuration: {e}")
@@ -1530,101 +1787,121 @@ class Configurator:
 
     def read_from_pi(self):
         """Read and display configuration data sent back from the Raspberry Pi Pico."""
-        port = input("Enter serial port (default: /dev/cu.usbmodem2101): ").strip() or "/dev/cu.usbmodem2101"
+        serial = import_serial()
+        if serial is None:
+            return False
+
+        port = prompt("Enter serial port (default: /dev/cu.usbmodem2101): ").strip() or "/dev/cu.usbmodem2101"
         baudrate = 115200
 
         try:
-            serial_connection = serial.Serial(port, baudrate)
+            serial_connection = serial.Serial(port, baudrate, timeout=SERIAL_READ_TIMEOUT_S)
         except serial.SerialException as e:
             print(f"Failed to open serial port {port}: {e}")
             return False
 
         try:
             # Send read command
-            read_command = f"<START>{{\"command\":\"read\"}}<END>\n"
-            serial_connection.write(read_command.encode())
+            serial_connection.write(READ_COMMAND_MESSAGE)
             serial_connection.flush()
 
-            buffer = ""
-            timeout = 5  # Increased to 5 seconds
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                if serial_connection.in_waiting > 0:
-                    char = serial_connection.read(1).decode()
-                    buffer += char
-                    if "<START>" in buffer and "<END>" in buffer:
-                        start = buffer.find("<START>") + len("<START>")
-                        end = buffer.find("<END>")
-                        json_str = buffer[start:end]
-                        try:
-                            received_data = json.loads(json_str)
-                            print("Received data:", received_data)
-                            return True  # Exit loop on successful response
-                        except json.JSONDecodeError as e:
-                            print("Failed to parse response JSON:", e)
-                            print(f"Raw buffer: {buffer!r}")
-                            return False
-                        finally:
-                            buffer = buffer[end + len("<END>"):]  # Clear processed part
-            print("No response received within timeout period.")
-            print(f"Raw buffer: {buffer!r}")
-            return False
+            payload, raw = read_framed_response(serial_connection, 5)
+            if payload is None:
+                print("No response received within timeout period.")
+                print(f"Raw buffer: {raw.decode(errors='replace')!r}")
+                return False
+            try:
+                received_data = json_decode(payload)
+                print("Received data:", received_data)
+                return True
+            except ValueError as e:
+                print("Failed to parse response JSON:", e)
+                print(f"Raw buffer: {raw.decode(errors='replace')!r}")
+                return False
         except Exception as e:
             print(f"Error reading from Pi: {e}")
             return False
         finally:
             serial_connection.close()
         
+    def edit_loaded_channels(self):
+        """Open the channel editor if a configuration is loaded"""
+        if self.config:
+            self.configure_channels()
+        else:
+            print("No configuration loaded. Please create or load one first.")
+
+    def confirm_exit(self):
+        """Offer to save an unsaved configuration before exiting"""
+        if self.config and not self.config_file:
+            save = prompt("Save configuration before exiting? (y/n): ").strip().lower()
+            if save in ['y', 'yes']:
+                self.save_config()
+        print("Goodbye!")
+
     def run(self):
         """Main application loop"""
         print("=== IoTextra Digital I/O Configuration Tool ===")
         print("This tool helps configure digital I/O nodes for IoTextra mezzanines.")
+
+        menu_actions = {
+            "1": self.create_new_config,
+            "2": self.load_config,
+            "3": self.save_config,
+            "4": self.edit_loaded_channels,
+            "5": self.display_config,
+            "6": self.send_to_pi,
+            "7": self.read_from_pi,
+        }
         
         while True:
-            print("\n" + "="*50)
-            print("Main Menu:")
-            print("1. Create new configuration")
-            print("2. Load configuration from file")
-            print("3. Save configuration to file")
-            print("4. Edit channel configuration")
-            print("5. View current configuration")
-            print("6. Send configuration to Pi")
-            print("7. Read configuration from Pi")
-            print("8. Exit")
-
-            choice = input("\nSelect option (1-8): ").strip()
-            
-            if choice == "1":
-                self.create_new_config()
-            elif choice == "2":
-                self.load_config()
-            elif choice == "3":
-                self.save_config()
-            elif choice == "4":
-                if self.config:
-                    self.configure_channels()
-                else:
-                    print("No configuration loaded. Please create or load one first.")
-            elif choice == "5":
-                self.display_config()
-            elif choice == "6":
-                self.send_to_pi()
-            elif choice == "7":
-                self.read_from_pi()
-            elif choice == "8":
-                if self.config and not self.config_file:
-                    save = input("Save configuration before exiting? (y/n): ").strip().lower()
-                    if save in ['y', 'yes']:
-                        self.save_config()
-                print("Goodbye!")
+            menu(
+                "\n" + "="*50,
+                "Main Menu:",
+                "1. Create new configuration",
+                "2. Load configuration from file",
+                "3. Save configuration to file",
+                "4. Edit channel configuration",
+                "5. View current configuration",
+                "6. Send configuration to Pi",
+                "7. Read configuration from Pi",
+                "8. Exit",
+            )
+
+            choice = prompt("\nSelect option (1-8): ").strip()
+
+            if choice == "8":
+                self.confirm_exit()
                 break
-            else:
+            action = menu_actions.get(choice)
+            if action is None:
                 print("Invalid choice. Please select 1-8.")
+            else:
+                action()
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command line parser; with no subcommand the interactive menu is started"""
+    parser = argparse.ArgumentParser(description="IoTflow Forge configuration tool")
+    subparsers = parser.add_subparsers(dest="command")
+
+    add_parser = subparsers.add_parser("add-channels", help="Add channels to a saved configuration from a JSON spec file")
+    add_parser.add_argument("--config", required=True, help="Configuration file to update")
+    add_parser.add_argument("--from", dest="spec", required=True, help="JSON list of channel specs ('#' comment lines allowed)")
+    add_parser.add_argument("--output", help="Write the result here instead of overwriting --config")
+    return parser
 
 def main():
     """Main entry point"""
+    args = build_arg_parser().parse_args()
     try:
         configurator = Configurator()
+        if args.command == "add-channels":
+            ok = (
+                configurator.load_config(args.config)
+                and configurator.add_channels_from_spec(args.spec)
+                and configurator.save_config(args.output or configurator.config_file)
+            )
+            sys.exit(0 if ok else 1)
         configurator.run()
     except KeyboardInterrupt:
         print("\n\nConfiguration interrupted by user.")
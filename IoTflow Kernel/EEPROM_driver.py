@@ -227,6 +227,43 @@ class EEPROM:
             
             offset += chunk_size
     
+    def update_bytes(self, address, data):
+        """
+        Write multiple bytes starting at the specified address, programming only
+        the pages whose current contents differ from data
+        
+        Args:
+            address: Starting memory address
+            data: bytes or list of integers to write
+            
+        Returns:
+            int: Number of page writes issued (0 if memory already held data)
+        """
+        if isinstance(data, (list, tuple)):
+            data = bytes(data)
+        
+        self._validate_address(address, len(data))
+        
+        # One bulk read of the target range, then compare page by page
+        current = self.read_bytes(address, len(data))
+        pages_written = 0
+        offset = 0
+        while offset < len(data):
+            current_addr = address + offset
+            
+            # Same page split as write_bytes, so each differing chunk is a single page write
+            bytes_left_in_page = self.PAGE_SIZE - (current_addr % self.PAGE_SIZE)
+            chunk_size = min(bytes_left_in_page, len(data) - offset)
+            chunk_data = data[offset:offset + chunk_size]
+            
+            if current[offset:offset + chunk_size] != chunk_data:
+                self.write_bytes(current_addr, chunk_data)
+                pages_written += 1
+            
+            offset += chunk_size
+        
+        return pages_written
+    
     def erase_page(self, page_number):
         """
         Erase a page (fill with 0xFF)
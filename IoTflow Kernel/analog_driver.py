@@ -36,7 +36,7 @@ class AnalogDriver:
         Args:
             i2c: Initialized I2C bus object
             config: Configuration dictionary containing:
-                - adc_i2c_addrs: List of ADC I2C addresses (hex strings)
+                - adc_i2c_addrs: List of ADC I2C addresses (ints, or hex strings)
                 - adc_sampling_rate: Sampling rate in SPS
                 - channels: List of channel configurations with analog settings
         """
@@ -91,15 +91,16 @@ class AnalogDriver:
         """Initialize all ADCs from the configuration."""
         adc_addrs = self.config.get('hardware', {}).get('adc_i2c_addrs', [])
         
-        for addr_str in adc_addrs:
+        for addr in adc_addrs:
             try:
-                addr = int(addr_str, 16)
+                if not isinstance(addr, int):
+                    addr = int(addr, 16)
                 # Initialize with default gain=1, will be set per channel later
                 adc = ads1x15.ADS1115(self.i2c, addr, gain=1)
                 self.adcs.append({'address': addr, 'instance': adc})
-                print(f"Initialized ADS1115 at address {addr_str}")
+                print(f"Initialized ADS1115 at address {hex(addr)}")
             except Exception as e:
-                print(f"Error initializing ADC at {addr_str}: {e}")
+                print(f"Error initializing ADC at {addr}: {e}")
     
     def _parse_channel_configs(self):
         """Parse channel configurations for analog channels."""
@@ -106,6 +106,9 @@ PIN_CONFIG = 0b00001111
 
 STATUS_UPDATE_INTERVAL_S = 30 # How often to publish status updates (in seconds)
 
+# Debug prints (per-message MQTT logging, serial/EEPROM diagnostics); they add noise on the serial link
+DEBUG = False
+
 
 CHANNELS = [
     {
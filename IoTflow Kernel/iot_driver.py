@@ -14,25 +14,44 @@ Last Updated: 2025-11-16
 import machine
 
 class IotDriver:
-    def __init__(self, bus_id, sda_pin, scl_pin, device_address, gpio_host_pins, pin_config, hardware_mode):
+    def __init__(self, bus_id, sda_pin, scl_pin, device_address, gpio_host_pins, pin_config, hardware_mode, i2c=None):
+        # i2c: optional already-initialized bus shared with other drivers; built from bus_id/sda_pin/scl_pin if omitted
         self.device_address = device_address
         self.i2c = None
         self.gpio_host_pins = gpio_host_pins
         self.hardware_mode = hardware_mode
         self.pin_config = pin_config # pin_config: 1 means input, 0 means output
         self.output_pin_state = 0b11111111 # All relays off initially -> this is to track state of the outputs on the firmware
-        self.gpio_pins = {} # to store machine.Pin objects for GPIO mode through a HOST connector
+        # machine.Pin objects for GPIO mode through a HOST connector (index i -> channel i + 1),
+        # kept as parallel input/output lists with None where the pin has the other direction
+        self._in_pin_objs = [None] * 8
+        self._out_pin_objs = [None] * 8
+        # Set from the input pin IRQ in GPIO mode; starts True so the first poll publishes every input
+        self._inputs_dirty = True
+        # Direction of each pin (index i -> channel i + 1), decoded once from pin_config
+        self._input_bits = tuple(bool((pin_config >> i) & 0x01) for i in range(8))
 
         # TCA9534 register addresses
         self.OUTPUT_PORT_REGISTER = 0x01
         self.INPUT_PORT_REGISTER = 0x00
         self.CONFIG_REGISTER = 0x03
 
+        # Reused I2C transfer buffers so set_output/read_all_inputs do not allocate per call
+        self._out_buf = bytearray(2)
+        self._out_buf[0] = self.OUTPUT_PORT_REGISTER
+        self._in_buf = bytearray(1)
+
         if self.hardware_mode == "i2c":
+            self._input_table = self._build_input_table()
             try:
-                self.i2c = machine.I2C(bus_id, sda=machine.Pin(sda_pin), scl=machine.Pin(scl_pin), freq=400000)
-                # configure IO expander on the board
-                self.i2c.writeto(self.device_address, bytes([self.CONFIG_REGISTER, self.pin_config]))
+                self.i2c = i2c if i2c is not None else machine.I2C(bus_id, sda=machine.Pin(sda_pin), scl=machine.Pin(scl_pin), freq=400000)
+                # configure IO expander on the board, unless it already holds this direction mask
+                # (the expander keeps its configuration across update_config re-inits)
+                current_config = self.i2c.readfrom_mem(self.device_address, self.CONFIG_REGISTER, 1)[0]
+                if current_config != self.pin_config:
+                    self.i2c.writeto(self.device_address, bytes([self.CONFIG_REGISTER, self.pin_config]))
+                # start from the outputs the expander is actually driving, so set_output can skip no-op writes
+                self.output_pin_state = self.i2c.readfrom_mem(self.device_address, self.OUTPUT_PORT_REGISTER, 1)[0]
                 print(f"Pin configuration of the board is set to {hex(self.pin_config)}.")
                 print(f"Successfully initialized I/O expander at device_address {hex(device_address)}.")
             except OSError as e:
@@ -41,84 +60,110 @@ class IotDriver:
         elif self.hardware_mode == "gpio":
             print("Initializing in GPIO mode.")
             for channel, pin_num in self.gpio_host_pins.items():
-                is_input = (self.pin_config >> (channel - 1)) & 0x01
-                if is_input:
-                    # configure as input with pull-up
-                    self.gpio_pins[channel] = machine.Pin(pin_num, machine.Pin.IN, machine.Pin.PULL_UP)
+                # channel keys are strings when the config came from JSON or the EEPROM
+                pin_index = int(channel) - 1
+                if self._input_bits[pin_index]:
+                    # configure as input with pull-up, flagging every edge for inputs_changed()
+                    pin = machine.Pin(pin_num, machine.Pin.IN, machine.Pin.PULL_UP)
+                    pin.irq(handler=self._on_input_edge, trigger=machine.Pin.IRQ_RISING | machine.Pin.IRQ_FALLING)
+                    self._in_pin_objs[pin_index] = pin
                 else:
                     # configure as output and set to default high state (relay off)
-                    self.gpio_pins[channel] = machine.Pin(pin_num, machine.Pin.OUT)
-                    self.gpio_pins[channel].value(1)
+                    pin = machine.Pin(pin_num, machine.Pin.OUT)
+                    pin.value(1)
+                    self._out_pin_objs[pin_index] = pin
             print("GPIO pins initialized.")
             
+    def _on_input_edge(self, pin):
+        # IRQ handler: only set a flag, the main loop does the reading and publishing
+        self._inputs_dirty = True
+
+    def deinit(self):
+        # Release the GPIO input pins before this driver is replaced: unbind the edge IRQs (which
+        # would otherwise keep this object alive) and drop the pull-ups
+        for pin in self._in_pin_objs:
+            if pin is not None:
+                pin.irq(handler=None)
+                pin.init(machine.Pin.IN, None)
+        self._in_pin_objs = [None] * 8
+
+    def inputs_changed(self):
+        # True if read_all_inputs may return something new since the last call. GPIO inputs are
+        # edge-triggered; the TCA9534 interrupt line is not wired, so I2C inputs are always polled.
+        if self.hardware_mode != "gpio":
+            return True
+        changed = self._inputs_dirty
+        self._inputs_dirty = False
+        return changed
+
+    def _build_input_table(self):
+        # Decoded read_all_inputs result for every possible input port byte. Bytes that differ
+        # only in output bits share one tuple, so at most 2**inputs tuples are allocated.
+        decoded = {}
+        table = []
+        for byte_val in range(256):
+            key = byte_val & self.pin_config
+            entry = decoded.get(key)
+            if entry is None:
+                # input pins report their inverted state (1 means there is signal), output pins None
+                entry = tuple(((byte_val >> i) & 0x01) ^ 0x01 if is_input else None
+                              for i, is_input in enumerate(self._input_bits))
+                decoded[key] = entry
+            table.append(entry)
+        return table
+
     def set_output(self, channel, state):
-        # check the channel is set to output (0)
-        if not ((self.pin_config >> (channel - 1)) & 0x01) == 0:
+        # check the channel exists and is set to output (0)
+        if not 1 <= channel <= 8 or self._input_bits[channel - 1]:
             return
 
         if self.hardware_mode == "i2c":
             if not self.i2c: return
-            print(f"Setting I2C output for channel {channel} to {state}")
             pin_index = channel - 1
             
             if state:
                 # set bit to 0 to activate relay (active-low)
-                self.output_pin_state &= ~(1 << pin_index)
+                new_state = self.output_pin_state & ~(1 << pin_index)
             else:
                 # set bit to 1 to deactivate relay
-                self.output_pin_state |= (1 << pin_index)
+                new_state = self.output_pin_state | (1 << pin_index)
+
+            # the output already has the requested value (e.g. a repeated or retained command)
+            if new_state == self.output_pin_state:
+                return
+            print(f"Setting I2C output for channel {channel} to {state}")
 
             try:
-                self.i2c.writeto(self.device_address, bytes([self.OUTPUT_PORT_REGISTER, self.output_pin_state]))
+                self._out_buf[1] = new_state
+                self.i2c.writeto(self.device_address, self._out_buf)
+                # only track the new state once the expander has accepted it, so a failed write is retried
+                self.output_pin_state = new_state
             except OSError as e:
                 print(f"Error writing to I2C device: {e}")
         
         elif self.hardware_mode == "gpio":
-            if channel in self.gpio_pins:
+            pin = self._out_pin_objs[channel - 1]
+            if pin is not None:
                 print(f"Setting GPIO output for channel {channel} to {state}")
                 # Use active-low logic: True -> 0, False -> 1
-                self.gpio_pins[channel].value(0 if state else 1)
+                pin.value(0 if state else 1)
 
     def read_all_inputs(self):
         if self.hardware_mode == "i2c":
             if not self.i2c: return None
             try:
                 # Read 1 byte from the INPUT_PORT_REGISTER (0x00)
-                data = self.i2c.readfrom_mem(self.device_address, self.INPUT_PORT_REGISTER, 1)
-                byte_val = int.from_bytes(data, 'big')
-
-                result = []
-                # pin_config: 1 means input, 0 means output
-                for i in range(8):
-                    if (self.pin_config >> i) & 0x01:
-                        # input pin: get its state
-                        state = (byte_val >> i) & 0x01
-                        # reversing state so that 1 means there is signal and 0 means no signal
-                        result.append(state ^ 0x01)
-                    else:
-                        # output pin: set as None
-                        result.append(None)
-                return result
+                self.i2c.readfrom_mem_into(self.device_address, self.INPUT_PORT_REGISTER, self._in_buf)
+                # shared, read-only tuple from the precomputed table
+                return self._input_table[self._in_buf[0]]
             except OSError as e:
                 print(f"Error reading from I2C device: {e}")
                 return None
         
         elif self.hardware_mode == "gpio":
-            result = []
-            for i in range(8):
-                channel = i + 1
-                if (self.pin_config >> i) & 0x01:
-                    # It's an input, read its value
-                    if channel in self.gpio_pins:
-                        state = self.gpio_pins[channel].value()
-                        # reversing state so that 1 means there is signal (GND) and 0 means no signal (PULL_UP)
-                        result.append(state ^ 0x01)
-                    else:
-                        result.append(None) # Should not happen if configured correctly
-                else:
-                    # It's an output, append None
-                    result.append(None)
-            return result
+            # reversing state so that 1 means there is signal (GND) and 0 means no signal (PULL_UP);
+            # outputs and unassigned pins report None; a tuple, like the I2C path returns
+            return tuple((p.value() ^ 0x01) if p is not None else None for p in self._in_pin_objs)
         
 
         return None
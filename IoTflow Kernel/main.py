@@ -17,12 +17,14 @@ Last Updated: 2025-11-16
 """
 
 import time
+import gc
 import machine
+import micropython
+from micropython import const
 import sys
 import os
 import uselect
 import ujson
-import struct
 import config
 from iot_driver import IotDriver
 from mqtt_manager import MqttManager
@@ -33,21 +35,50 @@ from analog_driver import AnalogDriver
 # Constants for EEPROM
 EEPROM_ADDR = config.EEPROM_I2C_ADDR  # 0x57
 EEPROM_SIZE = config.EEPROM_SIZE      # 1024
-DEBUG = False  # Disable debug prints to reduce serial noise
+EEPROM_LENGTH_PREFIX_SIZE = 2  # big-endian byte count stored at 0x000, before the packed config
+DEBUG = config.DEBUG  # Debug prints are off by default (config.py) to reduce serial noise
+WIFI_CONNECT_TIMEOUT_MS = const(10000)  # how long one background Wi-Fi connect attempt may take before it is reissued
+WIFI_RETRY_WINDOW_MS = const(20000)  # how long after losing Wi-Fi the watchdog keeps issuing reconnects
 
 os.dupterm(None, 0)
 
 # Serial communication markers
 START_MARKER = "<START>"
 END_MARKER = "<END>"
+# Byte forms used to scan the raw serial receive buffer
+START_MARKER_BYTES = b"<START>"
+END_MARKER_BYTES = b"<END>"
+# Exact payload the host (IoTflow Forge) sends to request the stored config; handled without parsing
+READ_COMMAND_PAYLOAD = b'{"command":"read"}'
+# Marker lengths folded in at compile time (must match the markers above)
+_START_MARKER_LEN = const(7)
+_END_MARKER_LEN = const(5)
+# Most receive-buffer bytes kept while no complete frame is found (well above a full config frame)
+_SERIAL_BUFFER_LIMIT = const(4096)
+# Longest a single serial drain may run before MQTT and I/O get serviced
+_SERIAL_DRAIN_BUDGET_MS = const(20)
 
 driver = None
 analog_driver = None
+i2c_bus = None  # I2C bus shared by IotDriver, AnalogDriver and the EEPROM
+i2c_bus_params = None  # (bus_id, scl_pin, sda_pin) i2c_bus was built with
 mqtt = None
 eeprom = None
-last_input_state = -1
+last_input_state = (None,) * 8  # last published state per input channel (None = not yet published)
 last_analog_values = {}  # Track last published analog values for deadband filtering
-buffer = ''
+analog_publish_cache = {}  # channel_number -> (unit, topic), rebuilt whenever analog_driver is created
+# Per-channel MQTT topics indexed by channel number 1-8 (index 0 unused), rebuilt when the base topic changes
+input_topics = []
+output_state_topics = []
+# Output command topics look like <command_topic_prefix><channel><COMMAND_TOPIC_SUFFIX>
+command_topic_prefix = ""
+COMMAND_TOPIC_SUFFIX = "/set"
+# Device-level topics, rebuilt together with the per-channel ones
+status_topic = ""
+heartbeat_topic = ""
+command_subscribe_topic = ""
+buffer = bytearray()  # raw serial bytes; only complete frames are decoded
+serial_byte = bytearray(1)  # reused target for reading stdin one byte at a time
 config_dict = {
     'WIFI_SSID': config.WIFI_SSID,
     'WIFI_PASSWORD': config.WIFI_PASSWORD,
@@ -63,7 +94,7 @@ config_dict = {
     'GPIO_HOST_PINS': config.GPIO_HOST_PINS,
     'PIN_CONFIG': config.PIN_CONFIG,
     'STATUS_UPDATE_INTERVAL_S': config.STATUS_UPDATE_INTERVAL_S,
-    'ADC_I2C_ADDRS': [hex(addr) for addr in config.ADC_I2C_ADDRS],
+    'ADC_I2C_ADDRS': list(config.ADC_I2C_ADDRS),  # ints, as normalized by update_config
     'ADC_SAMPLING_RATE': config.ADC_SAMPLING_RATE,
     'CHANNELS': config.CHANNELS,
 }
@@ -71,23 +102,81 @@ config_dict = {
 def send_data_back(data):
     """Send JSON data back over serial with markers."""
     try:
-        json_str = ujson.dumps(data)
-        sys.stdout.write(f"{START_MARKER}{json_str}{END_MARKER}\n")
+        # Stream the JSON straight to stdout instead of building the whole frame as one string
+        out = sys.stdout
+        out.write(START_MARKER)
+        ujson.dump(data, out)
+        out.write(END_MARKER)
+        out.write("\n")
 #         sys.stdout.flush()
     except Exception as e:
         if DEBUG:
             print("Error serializing/sending data:", e)
 
+@micropython.native
+def drain_serial(poller, deadline):
+    """Append the bytes waiting on stdin to the receive buffer until none are left or the
+    ticks_ms deadline passes. Returns True if stdin was fully drained."""
+    while True:
+        events = poller.poll(0)
+        if not events:
+            # No more serial data
+            return True
+        if time.ticks_diff(deadline, time.ticks_ms()) <= 0:
+            # a continuous stream must not starve the MQTT and I/O tasks
+            return False
+        for _, flag in events:
+            if flag & uselect.POLLIN:
+                # readinto a reused 1-byte buffer: no bytes object per received byte
+                sys.stdin.buffer.readinto(serial_byte)
+                buffer.append(serial_byte[0])
+
+@micropython.native
+def find_frame(buf):
+    """Return (start, end) of the first complete frame's payload in buf, or None."""
+    # MicroPython's bytearray has no find(), but `in` is a C-level scan that allocates nothing.
+    # Only once a frame end has arrived take a bytes snapshot and locate both markers in it:
+    # one scan for the start marker, then one for the end marker from just after it.
+    if END_MARKER_BYTES not in buf:
+        return None
+    data = bytes(buf)
+    start = data.find(START_MARKER_BYTES)
+    if start < 0:
+        return None
+    start += _START_MARKER_LEN
+    end = data.find(END_MARKER_BYTES, start)
+    if end < 0:
+        return None
+    return start, end
+
+def parse_int(value, base):
+    """Return value as an int, parsing string forms such as "0b00001111" or "0x3f" in the given base."""
+    return value if isinstance(value, int) else int(value, base)
+
+def get_i2c_bus():
+    """Return the shared I2C bus, only building a new one when the configured bus pins changed."""
+    global i2c_bus, i2c_bus_params
+    params = (config_dict['I2C_BUS_ID'], config_dict['I2C_SCL_PIN'], config_dict['I2C_SDA_PIN'])
+    if i2c_bus is None or params != i2c_bus_params:
+        i2c_bus = machine.I2C(params[0], scl=machine.Pin(params[1]), sda=machine.Pin(params[2]), freq=400000)
+        i2c_bus_params = params
+    return i2c_bus
+
 def update_config(new_config):
     """Update config_dict and reinitialize driver/mqtt."""
-    global driver, mqtt, config_dict, analog_driver
+    global driver, mqtt, config_dict, analog_driver, last_input_state
     try:
+        # Parse the string-encoded fields exactly once; driver code only sees the ints
+        pin_config = parse_int(new_config['pin_config'], 2)
+        device_addr = parse_int(new_config['hardware']['i2c_device_addr'], 16)
+        adc_addrs = [parse_int(addr, 16) for addr in new_config['hardware'].get('adc_i2c_addrs', [])]
+
         # Build hardware dict for AnalogDriver
         hardware_config = {
-            'adc_i2c_addrs': new_config['hardware'].get('adc_i2c_addrs', []),
+            'adc_i2c_addrs': adc_addrs,
             'adc_sampling_rate': new_config['hardware'].get('adc_sampling_rate', 128),
         }
-        
+
         # Update config_dict       
         config_dict.update({
             'WIFI_SSID': new_config['network']['wifi_ssid'],
@@ -100,26 +189,24 @@ def update_config(new_config):
             'I2C_BUS_ID': new_config['hardware']['i2c_bus_id'],
             'I2C_SDA_PIN': new_config['hardware']['i2c_sda_pin'],
             'I2C_SCL_PIN': new_config['hardware']['i2c_scl_pin'],
-            'I2C_DEVICE_ADDR': int(new_config['hardware']['i2c_device_addr'], 16),
+            'I2C_DEVICE_ADDR': device_addr,
             'GPIO_HOST_PINS': new_config['hardware']['gpio_host_pins'],
-            'PIN_CONFIG': int(new_config['pin_config'], 2),
+            'PIN_CONFIG': pin_config,
             'STATUS_UPDATE_INTERVAL_S': new_config['status_update_interval_s'],
-            'ADC_I2C_ADDRS': new_config['hardware'].get('adc_i2c_addrs', []),
+            'ADC_I2C_ADDRS': adc_addrs,
             'ADC_SAMPLING_RATE': new_config['hardware'].get('adc_sampling_rate', 128),
             'CHANNELS': new_config.get('channels', []),
             'HARDWARE': hardware_config,
         })
+        build_channel_topics()
 
 
-        # Reinitialize I2C
-        i2c = machine.I2C(
-            config_dict['I2C_BUS_ID'],
-            scl=machine.Pin(config_dict['I2C_SCL_PIN']),
-            sda=machine.Pin(config_dict['I2C_SDA_PIN']),
-            freq=400000
-        )
+        # Reuse the I2C bus unless its pins changed
+        i2c = get_i2c_bus()
         
-        # Reinitialize IotDriver
+        # Reinitialize IotDriver, releasing the old one's input pins and IRQs first
+        if driver:
+            driver.deinit()
         driver = IotDriver(
             config_dict['I2C_BUS_ID'],
             config_dict['I2C_SDA_PIN'],
@@ -127,8 +214,11 @@ def update_config(new_config):
             config_dict['I2C_DEVICE_ADDR'],
             config_dict['GPIO_HOST_PINS'],
             config_dict['PIN_CONFIG'],
-            config_dict['HARDWARE_MODE']
+            config_dict['HARDWARE_MODE'],
+            i2c=i2c
         )
+        # Pin directions or the base topic may have changed; republish every input once
+        last_input_state = (None,) * 8
         
         # Build config for AnalogDriver with required fields
         analog_config = {
@@ -141,6 +231,7 @@ def update_config(new_config):
         
         # Reinitialize AnalogDriver
         analog_driver = AnalogDriver(i2c, analog_config)
+        build_analog_publish_cache()
         
 
         # Reinitialize MqttManager
@@ -152,33 +243,60 @@ def update_config(new_config):
             config_dict['MQTT_PORT'],
             command_callback=handle_mqtt_command
         )
-        if MqttManager.is_wifi_connected() and mqtt.connect():
-            command_topic = f"{config_dict['MQTT_BASE_TOPIC']}/output/+/set"
-            mqtt.subscribe(command_topic)
-            mqtt.publish(f"{config_dict['MQTT_BASE_TOPIC']}/status", "online", retain=True)
+        # the client is connected by the caller: the Wi-Fi restart that follows a config
+        # update would drop a session opened here on the old link
         if DEBUG:
             print("Configuration updated and driver/mqtt reinitialized")
     except Exception as e:
         if DEBUG:
             print("Error updating configuration:", e)
 
+def connect_wifi(blocking=False):
+    """Start connecting to the configured Wi-Fi network (waiting for it if blocking).
+    Returns False if no connection was started."""
+    if not config_dict['WIFI_SSID']:
+        if DEBUG:
+            print("No Wi-Fi SSID configured, skipping Wi-Fi connect")
+        return False
+    connect = MqttManager.connect_wifi if blocking else MqttManager.start_wifi
+    return connect(config_dict['WIFI_SSID'], config_dict['WIFI_PASSWORD'])
+
+def connect_mqtt():
+    """Connect to the broker, subscribe to the output commands and mark the device online."""
+    if mqtt and mqtt.connect():
+        mqtt.subscribe(command_subscribe_topic)
+        mqtt.publish(status_topic, "online", retain=True)
+        return True
+    return False
+
+def build_channel_topics():
+    """Precompute the device and per-channel MQTT topics for the current base topic."""
+    global input_topics, output_state_topics, command_topic_prefix
+    global status_topic, heartbeat_topic, command_subscribe_topic
+    base_topic = config_dict['MQTT_BASE_TOPIC']
+    status_topic = f"{base_topic}/status"
+    heartbeat_topic = f"{base_topic}/heartbeat"
+    command_subscribe_topic = f"{base_topic}/output/+{COMMAND_TOPIC_SUFFIX}"
+    command_topic_prefix = f"{base_topic}/output/"
+    input_topics = [f"{base_topic}/input/{channel}" for channel in range(9)]
+    output_state_topics = [f"{base_topic}/output/{channel}/state" for channel in range(9)]
+
 def handle_mqtt_command(topic, msg):
     """Callback function to process incoming MQTT commands."""
     try:
         topic_str = topic.decode('utf-8') if isinstance(topic, bytes) else topic
         msg_str = msg.decode('utf-8') if isinstance(msg, bytes) else msg
-        parts = topic_str.split('/')
-        if len(parts) >= 3 and parts[-1] == "set" and parts[-3] == "output":
-            channel_str = parts[-2]
-            channel = int(channel_str)
+        if topic_str.startswith(command_topic_prefix) and topic_str.endswith(COMMAND_TOPIC_SUFFIX):
+            channel = int(topic_str[len(command_topic_prefix):-len(COMMAND_TOPIC_SUFFIX)])
+            if not 1 <= channel <= 8:
+                raise ValueError(f"channel {channel} out of range")
             state = bool(int(msg_str))
             if DEBUG:
                 print(f"Received MQTT command for channel {channel}: {state}")
             if driver:
                 driver.set_output(channel, state)
             if mqtt:
-                state_topic = f"{config_dict['MQTT_BASE_TOPIC']}/output/{channel}/state"
-                mqtt.publish(state_topic, str(int(state)), retain=True)
+                mqtt.publish(output_state_topics[channel], str(int(state)), retain=True)
     except (ValueError, IndexError, UnicodeError) as e:
         if DEBUG:
             print(f"Error parsing MQTT command: {e}")
@@ -186,7 +304,8 @@ def handle_mqtt_command(topic, msg):
 def check_and_publish_inputs():
     """Reads input states and publishes them if they have changed."""
     global last_input_state
-    if not driver:
+    # in GPIO mode the pins are only read after an edge interrupt
+    if not driver or not driver.inputs_changed():
         return
     current_inputs = driver.read_all_inputs()
     if current_inputs is None:
@@ -194,16 +313,25 @@ def check_and_publish_inputs():
     if current_inputs != last_input_state:
         if DEBUG:
             print("Input state changed, publishing updates")
-        for i in range(len(current_inputs)):
-            if current_inputs[i] is None:
+        # Publish only the channels whose state differs from the last published one
+        previous = last_input_state
+        for i, state in enumerate(current_inputs):
+            if state is None or state == previous[i]:
                 continue
-            channel = i + 1
-            state = current_inputs[i]
-            topic = f"{config_dict['MQTT_BASE_TOPIC']}/input/{channel}"
             if mqtt:
-                mqtt.publish(topic, str(int(state)), retain=True)
+                mqtt.publish(input_topics[i + 1], str(int(state)), retain=True)
         last_input_state = current_inputs
         
+def build_analog_publish_cache():
+    """Precompute the unit and MQTT topic of every configured analog channel."""
+    global analog_publish_cache
+    base_topic = config_dict['MQTT_BASE_TOPIC']
+    # channel_configs already carry the range type resolved from measurement_range
+    analog_publish_cache = {
+        channel: ("V" if ch_config.get('type') == 'voltage' else "mA", f"{base_topic}/analog/{channel}")
+        for channel, ch_config in analog_driver.channel_configs.items()
+    }
+
 def check_and_publish_analog():
     """Reads analog channels and publishes their values."""
     if not analog_driver or not mqtt:
@@ -212,31 +340,16 @@ def check_and_publish_analog():
         results = analog_driver.read_all_analog_channels()
         if results:
             for channel, value in results.items():
-                if value is not None:
-                    # Get channel config to determine if it's voltage or current
-                    channel_configs = analog_driver.channel_configs
-                    if channel in channel_configs:
-                        ch_config = channel_configs[channel]
-                        # Try to get measurement_range, fallback to type if missing
-                        if 'measurement_range' in ch_config:
-                            range_code = int(ch_config['measurement_range'], 2)
-                            config = analog_driver.range_configs.get(range_code)
-                        else:
-                            config = None
-                        
-                        # Determine unit based on type or config
-                        if config and config['type'] == 'voltage':
-                            unit = "V"
-                        elif ch_config.get('type') == 'voltage':
-                            unit = "V"
-                        else:
-                            unit = "mA"
-                        
-                        value_str = f"{value:.3f}"
-                        if DEBUG:
-                            print(f"Analog channel {channel}: {value_str}{unit}")
-                        topic = f"{config_dict['MQTT_BASE_TOPIC']}/analog/{channel}"
-                        mqtt.publish(topic, value_str, retain=True)
+                if value is None:
+                    continue
+                entry = analog_publish_cache.get(channel)
+                if entry is None:
+                    continue
+                unit, topic = entry
+                value_str = f"{value:.3f}"
+                if DEBUG:
+                    print(f"Analog channel {channel}: {value_str}{unit}")
+                mqtt.publish(topic, value_str, retain=True)
     except Exception as e:
         if DEBUG:
             print(f"Error reading/publishing analog values: {e}")
@@ -288,15 +401,15 @@ def read_eeprom_config():
     """Read configuration from EEPROM and return as dict."""
     global eeprom
     try:
-        length_bytes = eeprom.read_bytes(0x000, 2)
-        length = struct.unpack(">H", length_bytes)[0]
+        length_bytes = eeprom.read_bytes(0x000, EEPROM_LENGTH_PREFIX_SIZE)
+        length = int.from_bytes(length_bytes, "big")
         if DEBUG:
             print("EEPROM data length:", length)
-        if length > EEPROM_SIZE - 2:
+        if length > EEPROM_SIZE - EEPROM_LENGTH_PREFIX_SIZE:
             if DEBUG:
                 print("Error: Invalid data length in EEPROM")
             return None
-        raw = eeprom.read_bytes(0x002, length)
+        raw = eeprom.read_bytes(EEPROM_LENGTH_PREFIX_SIZE, length)
         restored = unpack_config(raw)
         #print("Restored config from EEPROM:", ujson.dumps(restored))
         return restored
@@ -306,12 +419,16 @@ def read_eeprom_config():
         return None
 
 def main():
-    global driver, mqtt, eeprom, buffer, analog_driver
+    global driver, mqtt, eeprom, analog_driver
+    # heartbeat uptime reference: ticks_ms wraps after ~12.4 days, the RTC seconds count does not
+    boot_s = time.time()
     try:
         # Initialize I2C and EEPROM
-        i2c = machine.I2C(config_dict['I2C_BUS_ID'], scl=machine.Pin(config_dict['I2C_SCL_PIN']), sda=machine.Pin(config_dict['I2C_SDA_PIN']), freq=400000)
+        i2c = get_i2c_bus()
         eeprom = EEPROM(i2c, EEPROM_ADDR)
         print("Pico script started")
+        # Prime ujson once; the first loads() before any dumps() is noticeably slower on MicroPython
+        ujson.dumps(None)
 
         # Read EEPROM configuration and update config_dict
         eeprom_config = read_eeprom_config()
@@ -321,14 +438,14 @@ def main():
             print("Loaded configuration from EEPROM")
         else:
             print("Failed to read EEPROM configuration, using config.py defaults")
+        build_channel_topics()
 
-        if not config_dict['WIFI_SSID']:
-            print("No Wi-Fi SSID configured, skipping Wi-Fi connect")
-        else:
-            MqttManager.connect_wifi(config_dict['WIFI_SSID'], config_dict['WIFI_PASSWORD'])
+        connect_wifi(blocking=True)
         
 #         print(config_dict)
         # Initialize Wi-Fi, IotDriver, and MqttManager
+        # (the EEPROM config may have moved the bus, in which case get_i2c_bus() rebuilt it)
+        i2c = get_i2c_bus()
         driver = IotDriver(
             config_dict['I2C_BUS_ID'],
             config_dict['I2C_SDA_PIN'],
@@ -336,7 +453,8 @@ def main():
             config_dict['I2C_DEVICE_ADDR'],
             config_dict['GPIO_HOST_PINS'],
             config_dict['PIN_CONFIG'],
-            config_dict['HARDWARE_MODE']
+            config_dict['HARDWARE_MODE'],
+            i2c=i2c
         )
         
         # Build config for AnalogDriver with required fields
@@ -350,6 +468,7 @@ def main():
         
         # Initialize AnalogDriver
         analog_driver = AnalogDriver(i2c, analog_config)
+        build_analog_publish_cache()
                          
         analog_driver.print_channel_configs()
 
@@ -360,91 +479,122 @@ def main():
             command_callback=handle_mqtt_command
         )
                 
-        if mqtt.connect():
-            command_topic = f"{config_dict['MQTT_BASE_TOPIC']}/output/+/set"
-            mqtt.subscribe(command_topic)
-            mqtt.publish(f"{config_dict['MQTT_BASE_TOPIC']}/status", "online", retain=True)
+        connect_mqtt()
     
-        last_status_update = time.time()
+        last_status_update = time.ticks_ms()
         poller = uselect.poll()
         poller.register(sys.stdin, uselect.POLLIN)
         
-        wifi_retry_start = None   # timestamp of first retry attempt
+        wifi_retry_start = None   # ticks_ms of first retry attempt
         wifi_retry_stop = False   # flag to stop further retries
+        wifi_attempt_start = None  # ticks_ms the pending background connect was issued, None if none pending
 
         while True:
             # Check for serial input
-            events = poller.poll(0)  # 5ms timeout for responsiveness
+            # Wait up to 10ms for serial input; this is also the idle pacing of the background tasks,
+            # so the loop sleeps in poll() instead of spinning and wakes as soon as a byte arrives
+            events = poller.poll(10)
             
             if events:  # Serial data is available
-                # Keep processing serial input until buffer is empty
+                # Drain the waiting bytes into the receive buffer before scanning it for frames
+                drained = drain_serial(poller, time.ticks_add(time.ticks_ms(), _SERIAL_DRAIN_BUDGET_MS))
+
+                # Handle every complete frame now in the buffer
                 while True:
-                    events = poller.poll(0)
-                    if not events:
-                        # No more serial data - exit inner loop and go back to check again
+                    frame = find_frame(buffer)
+                    if frame is None:
                         break
-                    
-                    for _, flag in events:
-                        if flag & uselect.POLLIN:
-                            char = sys.stdin.read(1)
-                            buffer += char
-                            if START_MARKER in buffer and END_MARKER in buffer:
-                                start = buffer.find(START_MARKER) + len(START_MARKER)
-                                end = buffer.find(END_MARKER)
-                                json_str = buffer[start:end]
-                                buffer = buffer[end + len(END_MARKER):]
-                                try:
-                                    data = ujson.loads(json_str)
-                                    if data.get("command") == "read":
-                                        if DEBUG:
-                                            print("Received read command")
-                                        restored = read_eeprom_config()
-                                        if restored:
-                                            send_data_back(restored)
-                                        else:
-                                            send_data_back({"error": "Failed to read or unpack EEPROM data"})
-                                    else:
-                                        packed = pack_config(data)
-                                        if DEBUG:
-                                            print("Packed size:", len(packed), "bytes")
-                                        if len(packed) > EEPROM_SIZE - 2:
-                                            print("Error: Packed data too large for EEPROM")
-                                            continue
-                                        length_bytes = struct.pack(">H", len(packed))
-                                        eeprom.write_bytes(0x000, length_bytes)
-                                        eeprom.write_bytes(0x002, packed)
-                                        if DEBUG:
-                                            print("Wrote data to EEPROM")
-                                        raw = eeprom.read_bytes(0x002, len(packed))
-                                        restored = unpack_config(raw)
-                                        if DEBUG:
-                                            print("Restored config:", ujson.dumps(restored))
-                                        send_data_back(restored)
-                                        update_config(restored)
-                                        if not config_dict['WIFI_SSID']:
-                                            if DEBUG:
-                                                print("No Wi-Fi SSID configured, skipping Wi-Fi connect")
-                                        else:
-                                            MqttManager.connect_wifi(config_dict['WIFI_SSID'],config_dict['WIFI_PASSWORD'])
-                                except ValueError as e:
-                                    if DEBUG:
-                                        print("JSON parsing error:", e)
-                                except OSError as e:
-                                    if DEBUG:
-                                        print("EEPROM operation error:", e)
-                                except Exception as e:
-                                    if DEBUG:
-                                        print("Unexpected error:", e)
+                    start, end = frame
+                    try:
+                        # The read request is a fixed payload: recognise it by a length check and a
+                        # short compare instead of a JSON parse. Other spellings still parse below.
+                        is_read = end - start == len(READ_COMMAND_PAYLOAD) and buffer[start:end] == READ_COMMAND_PAYLOAD
+                        if not is_read:
+                            # ujson.loads accepts any buffer object, so the frame is parsed straight
+                            # out of the receive buffer without slicing or decoding it into a str
+                            data = ujson.loads(memoryview(buffer)[start:end])
+                            is_read = data.get("command") == "read"
+                        if is_read:
+                            if DEBUG:
+                                print("Received read command")
+                            restored = read_eeprom_config()
+                            if restored:
+                                send_data_back(restored)
+                            else:
+                                send_data_back({"error": "Failed to read or unpack EEPROM data"})
+                        else:
+                            packed = pack_config(data)
+                            if DEBUG:
+                                print("Packed size:", len(packed), "bytes")
+                            if len(packed) > EEPROM_SIZE - EEPROM_LENGTH_PREFIX_SIZE:
+                                print("Error: Packed data too large for EEPROM")
+                                continue
+                            # length prefix and payload as one record, so page 0 is programmed once
+                            record = len(packed).to_bytes(EEPROM_LENGTH_PREFIX_SIZE, "big") + packed
+                            # only the pages whose contents changed are programmed, so re-sending the
+                            # same config (or a small edit of it) spends few or no EEPROM write cycles
+                            pages_written = eeprom.update_bytes(0x000, record)
+                            if DEBUG:
+                                if pages_written == 0:
+                                    print("EEPROM already holds this config, skipping write")
+                                else:
+                                    print("Wrote", pages_written, "EEPROM pages")
+                                    # verify the write only when debugging; the normal path echoes the packed bytes
+                                    if eeprom.read_bytes(EEPROM_LENGTH_PREFIX_SIZE, len(packed)) != packed:
+                                        print("EEPROM verify mismatch after write")
+                            restored = unpack_config(packed)
+                            if DEBUG:
+                                print("Restored config:", ujson.dumps(restored))
+                            send_data_back(restored)
+                            update_config(restored)
+                            if connect_wifi():
+                                # the watchdog below waits for the connection and then reconnects MQTT;
+                                # this is a fresh attempt, not a continuation of an earlier outage
+                                wifi_attempt_start = time.ticks_ms()
+                                wifi_retry_start = None
+                                wifi_retry_stop = False
+                            elif MqttManager.is_wifi_connected():
+                                # no restart (no SSID configured): the new client can connect on the current link
+                                connect_mqtt()
+                    except ValueError as e:
+                        if DEBUG:
+                            print("JSON parsing error:", e)
+                    except OSError as e:
+                        if DEBUG:
+                            print("EEPROM operation error:", e)
+                    except Exception as e:
+                        if DEBUG:
+                            print("Unexpected error:", e)
+                    finally:
+                        # drop the handled frame in place (slice assignment: MicroPython's bytearray
+                        # has no slice deletion); also runs on the early continue
+                        buffer[:end + _END_MARKER_LEN] = b""
                 
-                # Finished processing all available serial input
-                # Go back to top of loop to check for more serial or do background tasks
-                time.sleep(0.001)  # 1ms - let buffer refill
-                continue
+                if len(buffer) > _SERIAL_BUFFER_LIMIT:
+                    # Malformed input (a frame that never ends, noise without markers) must not grow the
+                    # buffer without bound: keep only a frame that may still be arriving, i.e. the bytes
+                    # from the last start marker, or nothing if that alone is over the limit
+                    start = bytes(buffer).rfind(START_MARKER_BYTES)
+                    if 0 < start and len(buffer) - start <= _SERIAL_BUFFER_LIMIT:
+                        buffer[:start] = b""
+                    else:
+                        buffer[:] = b""
+
+                if drained:
+                    # Finished processing all available serial input
+                    # Go back to top of loop to check for more serial or do background tasks
+                    time.sleep(0.001)  # 1ms - let buffer refill
+                    continue
+                # Out of drain budget with input still waiting: run the background tasks once first
 
             # MQTT and I/O tasks
             if MqttManager.is_wifi_connected():
+                if wifi_retry_start is not None or wifi_attempt_start is not None:
+                    # Wi-Fi came back after an outage or a config restart; no MQTT session survived it
+                    connect_mqtt()
                 wifi_retry_start = None
                 wifi_retry_stop = False
+                wifi_attempt_start = None
                 if mqtt:
                     try:
                         mqtt.check_for_messages()
@@ -453,10 +603,13 @@ def main():
                             print(f"Error checking MQTT messages: {e}")
                 check_and_publish_inputs()
                 check_and_publish_analog()
-                if time.time() - last_status_update > config_dict['STATUS_UPDATE_INTERVAL_S']:
+                if time.ticks_diff(time.ticks_ms(), last_status_update) > config_dict['STATUS_UPDATE_INTERVAL_S'] * 1000:
                     if mqtt:
-                        mqtt.publish(f"{config_dict['MQTT_BASE_TOPIC']}/status", "online")
-                    last_status_update = time.time()
+                        # the retained "online" on <base>/status is only published on connect; the periodic
+                        # heartbeat carries uptime and free heap instead of repeating it
+                        heartbeat = ujson.dumps({"uptime": time.time() - boot_s, "heap": gc.mem_free()})
+                        mqtt.publish(heartbeat_topic, heartbeat)
+                    last_status_update = time.ticks_ms()
 #             else:
 #                 if DEBUG:
 #                     print("Wi-Fi connection lost. Attempting to reconnect...")
@@ -466,32 +619,29 @@ def main():
 #                     mqtt.subscribe(command_topic)
             else:
                 # --- Wi-Fi reconnect watchdog ---
+                # Connects run in the background (connect_wifi()), so serial input and the loop keep
+                # running while the radio associates; each pass only checks the clock.
                 if not wifi_retry_stop:
+                    now = time.ticks_ms()
                     if wifi_retry_start is None:
-                        wifi_retry_start = time.time()
+                        wifi_retry_start = now
+                        # one collection per outage, before the first reconnect allocates the Wi-Fi/socket state
+                        gc.collect()
                         if DEBUG:
                             print("Wi-Fi lost, starting retry timer")
 
-                    # Attempt reconnect only while <30 s from first retry
-                    if time.time() - wifi_retry_start < 20:
-                        if DEBUG:
-                            print("Attempting Wi-Fi reconnect...")
-                            
-                        if not config_dict['WIFI_SSID']:
+                    # Attempt reconnect only while <20 s from first retry
+                    if time.ticks_diff(now, wifi_retry_start) < WIFI_RETRY_WINDOW_MS:
+                        # (re)issue a connect when none is pending or the pending one has timed out
+                        if wifi_attempt_start is None or time.ticks_diff(now, wifi_attempt_start) > WIFI_CONNECT_TIMEOUT_MS:
                             if DEBUG:
-                                print("No Wi-Fi SSID configured, skipping Wi-Fi connect")
-                        else:
-                            MqttManager.connect_wifi(config_dict['WIFI_SSID'],config_dict['WIFI_PASSWORD'])
-                        
-                        if mqtt and mqtt.connect():
-                            command_topic = f"{config_dict['MQTT_BASE_TOPIC']}/output/+/set"
-                            mqtt.subscribe(command_topic)
+                                print("Attempting Wi-Fi reconnect...")
+                            connect_wifi()
+                            wifi_attempt_start = now
                     else:
                         wifi_retry_stop = True
                         if DEBUG:
-                            print("Wi-Fi reconnect timed out (30 s). Stopping retries.")
-
-            time.sleep(0.01)  # 10ms delay for balance
+                            print("Wi-Fi reconnect timed out (20 s). Stopping retries.")
 
     except Exception as e:
         print(f"A critical error occurred: {e}")
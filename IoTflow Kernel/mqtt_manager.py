@@ -15,7 +15,9 @@ Last Updated: 2025-11-16
 import time
 from umqtt_simple import MQTTClient
 import network
-import gc
+from config import DEBUG
+
+RADIO_SETTLE_MS = 100  # pause between switching the radio off and on again in start_wifi()
 
 class MqttManager:
     def __init__(self, client_id, broker, port, command_callback=None):
@@ -41,12 +43,16 @@ class MqttManager:
             return False
 
     def subscribe(self, topic):
-        print(f"Subscribing to topic: {topic}")
+        if DEBUG:
+            print(f"Subscribing to topic: {topic}")
         self.client.subscribe(topic)
         
     def publish(self, topic, message, retain=False):
-        print(f"Publishing to {topic}: {message}")
-        self.client.publish(topic, str(message), retain)
+        if DEBUG:
+            print(f"Publishing to {topic}: {message}")
+        # callers mostly pass ready-made str/bytes payloads; only convert anything else
+        payload = message if isinstance(message, (str, bytes)) else str(message)
+        self.client.publish(topic, payload, retain)
 
     def check_for_messages(self):
         self.client.check_msg()
@@ -54,22 +60,24 @@ class MqttManager:
     def _mqtt_callback(self, topic, msg):
         topic = topic.decode()
         msg = msg.decode()
-        print(f"Message received on topic '{topic}': {msg}")
+        if DEBUG:
+            print(f"Message received on topic '{topic}': {msg}")
         if self.command_callback:
             self.command_callback(topic, msg)
         
     @staticmethod
-    def connect_wifi(ssid, password):
+    def start_wifi(ssid, password):
+        # Reset the radio and issue the connect without waiting for it; poll is_wifi_connected()
+        # afterwards. Returns False if no connect could be started.
         wlan = network.WLAN(network.STA_IF)
 
-        # Force a clean start
+        # Force a clean start. The CYW43 driver reports inactive as soon as active(False) returns,
+        # before the chip has powered down, so there is no state to poll: wait a fixed settle time
         wlan.active(False)
-        time.sleep(0.5)
+        time.sleep_ms(RADIO_SETTLE_MS)
         wlan.active(True)
         wlan.disconnect()
-        gc.collect()
         
-        timeout = 10
         if not ssid:
             print("No SSID configured; skipping Wi-Fi connection.")
             return False
@@ -81,7 +89,16 @@ class MqttManager:
             # Covers the "Wifi Internal Error" case
             print(f"Wi-Fi connect() failed immediately: {e}")
             return False
+        return True
+
+    @staticmethod
+    def connect_wifi(ssid, password):
+        # Blocking form of start_wifi(): waits up to timeout seconds for the connection
+        if not MqttManager.start_wifi(ssid, password):
+            return False
 
+        wlan = network.WLAN(network.STA_IF)
+        timeout = 10
         start = time.time()
         while not wlan.isconnected():
             if time.time() - start > timeout: